@@ -0,0 +1,86 @@
+import math
+
+import numpy as np
+
+# Amostragem exata de jogos que respeitam a janela de soma e o mínimo de pares e
+# ímpares. Uma programação dinâmica sobre (quantidade, soma, pares) acumula o
+# peso total de todas as combinações válidas; cada jogo é então sorteado
+# percorrendo os candidatos e incluindo cada um com a probabilidade condicional
+# correta. Todo jogo devolvido é válido e a probabilidade de cada combinação é
+# proporcional ao produto das frequências dos seus números. O sorteio é
+# vetorizado sobre os N jogos pedidos.
+
+
+class RestricoesImpossiveis(ValueError):
+    pass
+
+
+class AmostradorEstatistico:
+    def __init__(self, candidatos, pesos, num_bolas, soma_min, soma_max, min_pares=2, min_impares=2):
+        self.candidatos = np.asarray(candidatos, dtype=np.int64)
+        pesos = np.asarray(pesos, dtype=np.float64)
+        # Normalizar evita overflow no produto dos pesos de jogos grandes (LotoFacil).
+        self.pesos = pesos / pesos.mean()
+        self.num_bolas = num_bolas
+        self.soma_min = max(0, math.ceil(soma_min))
+        self.soma_max = math.floor(soma_max)
+        self.min_pares = min_pares
+        self.max_pares = num_bolas - min_impares
+        self.paridade = (self.candidatos % 2 == 0).astype(np.int64)
+        if self.soma_max < self.soma_min or self.max_pares < self.min_pares:
+            raise RestricoesImpossiveis("Janela de soma ou paridade vazia.")
+        self._tabela = self._montar_tabela()
+        self._estados_finais, self._pesos_finais = self._distribuicao_final()
+
+    def _montar_tabela(self):
+        # tabela[i][c, s, e]: peso total de escolher c números entre os candidatos
+        # i.. com soma s e e pares.
+        n, k, s_max = len(self.candidatos), self.num_bolas, self.soma_max
+        tabela = np.zeros((n + 1, k + 1, s_max + 1, k + 1), dtype=np.float64)
+        tabela[n, 0, 0, 0] = 1.0
+        for i in range(n - 1, -1, -1):
+            tabela[i] = tabela[i + 1]
+            v, p, w = self.candidatos[i], self.paridade[i], self.pesos[i]
+            if v <= s_max:
+                tabela[i, 1:, v:, p:] += w * tabela[i + 1, :-1, :s_max + 1 - v, :k + 1 - p]
+        return tabela
+
+    def _distribuicao_final(self):
+        final = self._tabela[0, self.num_bolas, self.soma_min:, self.min_pares:self.max_pares + 1]
+        somas, pares = np.nonzero(final)
+        pesos = final[somas, pares]
+        if pesos.size == 0:
+            raise RestricoesImpossiveis("Nenhuma combinação dos candidatos satisfaz as restrições.")
+        estados = np.stack([somas + self.soma_min, pares + self.min_pares], axis=1)
+        return estados, pesos / pesos.sum()
+
+    @property
+    def peso_total(self):
+        return float(self._tabela[0, self.num_bolas, self.soma_min:, self.min_pares:self.max_pares + 1].sum())
+
+    def amostrar(self, n, rng=None):
+        if rng is None:
+            rng = np.random.default_rng()
+        escolha = rng.choice(len(self._pesos_finais), size=n, p=self._pesos_finais)
+        soma = self._estados_finais[escolha, 0].copy()
+        pares = self._estados_finais[escolha, 1].copy()
+        restantes = np.full(n, self.num_bolas, dtype=np.int64)
+        jogos = np.zeros((n, self.num_bolas), dtype=np.int64)
+        for i, (v, p, w) in enumerate(zip(self.candidatos, self.paridade, self.pesos)):
+            ativos = restantes > 0
+            if not ativos.any():
+                break
+            possivel = ativos & (soma >= v) & (pares >= p)
+            atual = self._tabela[i, restantes, soma, pares]
+            anterior = np.zeros(n)
+            idx = np.nonzero(possivel)[0]
+            anterior[idx] = self._tabela[i + 1, restantes[idx] - 1, soma[idx] - v, pares[idx] - p]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                prob = np.where(possivel & (atual > 0), w * anterior / atual, 0.0)
+            incluir = rng.random(n) < prob
+            jogos[incluir, self.num_bolas - restantes[incluir]] = v
+            restantes -= incluir
+            soma -= v * incluir
+            pares -= p * incluir
+        jogos.sort(axis=1)
+        return jogos
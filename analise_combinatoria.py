@@ -0,0 +1,94 @@
+from functools import cached_property
+
+import numpy as np
+
+from pontuacao_bilhetes import PontuadorBilhetes
+
+# Análises sobre a matriz de incidência (sorteios × números) de MatrizSorteios:
+# coocorrência de pares e trios por produto de matrizes (Aᵀ·A, via BLAS),
+# atrasos por número e distribuição de acertos de um bilhete no histórico.
+# A incidência é usada como presença (0/1) em float32, que representa
+# contagens exatas até 2**24 sorteios.
+
+
+class AnaliseCombinatoria:
+    def __init__(self, matriz):
+        self.matriz = matriz
+
+    @property
+    def numeros(self):
+        return self.matriz.numeros
+
+    @cached_property
+    def presenca(self):
+        return (self.matriz.incidencia > 0).astype(np.float32)
+
+    @cached_property
+    def pares(self):
+        # pares[i, j]: sorteios em que i e j saíram juntos (diagonal = frequência).
+        return (self.presenca.T @ self.presenca).astype(np.int64)
+
+    @cached_property
+    def trios(self):
+        # trios[i, j, l]: sorteios com i, j e l juntos. Para cada i, o mesmo
+        # Aᵀ·A restrito aos sorteios em que i saiu.
+        A = self.presenca
+        n = A.shape[1]
+        trios = np.zeros((n, n, n), dtype=np.int64)
+        for i in range(n):
+            linhas = A[A[:, i] > 0]
+            if len(linhas):
+                trios[i] = linhas.T @ linhas
+        return trios
+
+    @cached_property
+    def _atrasos(self):
+        # Em cada sorteio, há quantos sorteios o número não sai (0 se saiu nele).
+        # Números que nunca saíram contam desde o primeiro sorteio.
+        presente = self.matriz.incidencia > 0
+        indices = np.arange(len(presente))[:, None]
+        ultimo = np.maximum.accumulate(np.where(presente, indices, -1), axis=0)
+        return indices - ultimo
+
+    @cached_property
+    def atraso_atual(self):
+        if not len(self._atrasos):
+            return np.zeros(len(self.numeros), dtype=np.int64)
+        return self._atrasos[-1]
+
+    @cached_property
+    def atraso_maximo(self):
+        if not len(self._atrasos):
+            return np.zeros(len(self.numeros), dtype=np.int64)
+        return self._atrasos.max(axis=0)
+
+    def _mais_frequentes(self, contagens, combinacoes, n):
+        n = min(n, len(combinacoes))
+        if n == 0:
+            return []
+        topo = np.argpartition(-contagens, n - 1)[:n]
+        topo = topo[np.lexsort((topo, -contagens[topo]))]
+        return [(tuple(int(self.numeros[c]) for c in combinacoes[t]), int(contagens[t])) for t in topo]
+
+    def pares_mais_frequentes(self, n=10):
+        i, j = np.triu_indices(len(self.numeros), k=1)
+        return self._mais_frequentes(self.pares[i, j], np.column_stack([i, j]), n)
+
+    def trios_mais_frequentes(self, n=10):
+        total = len(self.numeros)
+        i, j, l = np.meshgrid(np.arange(total), np.arange(total), np.arange(total), indexing="ij")
+        crescentes = (i < j) & (j < l)
+        combinacoes = np.column_stack([i[crescentes], j[crescentes], l[crescentes]])
+        return self._mais_frequentes(self.trios[crescentes], combinacoes, n)
+
+    @cached_property
+    def pontuador(self):
+        return PontuadorBilhetes(self.presenca, self.matriz.min_num)
+
+    def acertos(self, bilhete):
+        # Acertos do bilhete em cada sorteio do histórico.
+        return self.pontuador.matriz_acertos([sorted(set(int(n) for n in bilhete))])[0].astype(np.int64)
+
+    def distribuicao_acertos(self, bilhete):
+        # distribuicao[h]: em quantos sorteios o bilhete teria acertado h números.
+        return self.pontuador.histograma([sorted(set(int(n) for n in bilhete))])[0]
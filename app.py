@@ -1,13 +1,16 @@
+import sys
+from importlib.machinery import ModuleSpec
+
 import streamlit as st
-from utils import (
-    carregar_dados, obter_numeros, frequencia_numeros,
-    gerar_multiplas_sugestoes_estatisticas, gerar_jogo_neural,
-    gerar_jogo_neural_multilabel, validar_modelo_neural_multilabel,
-    calcular_acuracia_sugestao, exploracao_de_dados, estatisticas_soma,
-    gerar_jogo_timemania, gerar_jogo_milionaria, gerar_jogo_supersete,
-    cor_fundo_sugestao 
-)
 
+# A cada execução o Streamlit instala um módulo __main__ novo, com o __file__
+# deste script e sem __spec__; os workers do backtest (forkserver/spawn)
+# reexecutariam a página inteira ao reconstruir o __main__. Com o nome
+# "__main__" no __spec__, o multiprocessing não reimporta o script nos filhos.
+sys.modules["__main__"].__spec__ = ModuleSpec("__main__", None)
+
+# Só o necessário para a tela de login é importado aqui; os módulos de cada aba
+# (scikit-learn, matplotlib...) são carregados quando a aba é aberta.
 senha_correta = st.secrets["auth"]["senha"]
 
 if "autenticado" not in st.session_state:
@@ -23,54 +26,43 @@ if not st.session_state.autenticado:
             st.error("Chave incorreta.")
     st.stop()
 
-TIMES_TIMEMANIA = [
-    "ABC", "ALTOS", "AMAZONAS", "AMÉRICA", "APARECIDENSE", "ATHLETIC CLUB",
-    "ATHLETICO", "ATLÉTICO", "ATLÉTICO MINEIRO", "AVAÍ", "BAHIA", "BAHIA DE FEIRA",
-    "BOTAFOGO", "BRAGANTINO", "BRASIL", "BRASILIENSE", "BRUSQUE", "CAMPINENSE", "CASCAVEL",
-    "CAXIAS", "CEARÁ", "CEILÂNDIA", "CHAPECOENSE", "CONFIANÇA", "CORINTHIANS", "CORITIBA",
-    "CRB", "CRICIÚMA", "CRUZEIRO", "CSA", "CUIABÁ", "FERROVIÁRIA", "FERROVIÁRIO",
-    "FIGUEIRENSE", "FLAMENGO", "FLORESTA", "FLUMINENSE", "FORTALEZA", "GOIÁS", "GRÊMIO",
-    "GUARANI", "INTERNACIONAL", "ITUANO", "JACUIPENSE", "JUAZEIRENSE", "JUVENTUDE",
-    "LONDRINA", "MANAUS", "MIRASSOL", "NÁUTICO", "NOVA IGUAÇU", "NOVORIZONTINO",
-    "OESTE", "OPERÁRIO", "PALMEIRAS", "PARANÁ", "PAYSANDU", "PONTE PRETA", "PORTUGUESA",
-    "POUSO ALEGRE", "REMO", "RETRÔ", "SAMPAIO CORRÊA", "SANTA CRUZ", "SANTOS", "SÃO BERNARDO",
-    "SÃO JOSÉ", "SÃO PAULO", "SÃO RAIMUNDO", "SPORT", "TOCANTINÓPOLIS", "TOMBENSE",
-    "VASCO", "VILA NOVA", "VITÓRIA", "VOLTA REDONDA", "YPIRANGA"
-]
-
-configs_jogos = {
-    "LotoFacil": {"min_num": 1, "max_num": 25, "num_bolas": 15},
-    "MegaSena": {"min_num": 1, "max_num": 60, "num_bolas": 6},
-    "Quina": {"min_num": 1, "max_num": 80, "num_bolas": 5},
-    "Milionaria": {
-        "min_num": 1,
-        "max_num": 50,
-        "num_bolas": 6,
-        "quantidade_trevos_selecionar": 2,
-        "faixa_trevos_disponiveis": (1, 6)
-    },
-    "DuplaSena": {"min_num": 1, "max_num": 50, "num_bolas": 6},
-    "Timemania": {
-        "min_num": 1,
-        "max_num": 80,
-        "num_bolas": 10,
-        "quantidade_times_selecionar": 1,
-        "lista_times_disponiveis": TIMES_TIMEMANIA
-    },
-    "DiaDeSorte": {
-        "min_num": 1,
-        "max_num": 31,
-        "num_bolas": 7,
-        "quantidade_meses_selecionar": 1
-    },
-    "SuperSete": {
-        "min_num": 0,
-        "max_num": 9,
-        "num_bolas": 7,
-        "quantidade_colunas": 7,
-        "faixa_numeros_por_coluna": (0, 9)
-    }
-}
+import os
+
+from instrumentacao import encerrar_coleta, iniciar_coleta, servir_prometheus
+
+# Instrumentação (instrumentacao.py): LOTERICAS_PERFIL_PORTA expõe /metrics no
+# formato do Prometheus e LOTERICAS_PERFIL_PAINEL=1 mostra na barra lateral o
+# tempo de cada função chamada neste rerun.
+if os.environ.get("LOTERICAS_PERFIL_PORTA"):
+    servir_prometheus(int(os.environ["LOTERICAS_PERFIL_PORTA"]))
+area_perfil = st.sidebar.empty() if os.environ.get("LOTERICAS_PERFIL_PAINEL") == "1" else None
+iniciar_coleta()
+
+def exibir_perfil():
+    coleta = encerrar_coleta()
+    if area_perfil is None or coleta is None:
+        return
+    with area_perfil.expander(f"Perfil deste rerun ({coleta.duracao() * 1000:.0f} ms)"):
+        st.dataframe([
+            {
+                "função": linha["funcao"],
+                "chamadas": linha["chamadas"],
+                "total (ms)": round(linha["tempo_total_s"] * 1000, 1),
+                "máx (ms)": round(linha["tempo_max_s"] * 1000, 1),
+                "cache acertos": linha["cache_acertos"],
+                "cache falhas": linha["cache_falhas"],
+                "pico (MB)": round(linha["pico_memoria_bytes"] / 2**20, 2),
+            }
+            for linha in coleta.linhas()
+        ], hide_index=True)
+
+from armazenamento import ler_planilha, versao_dados
+from cache_compartilhado import cache_padrao
+from jogos import configs_jogos
+from regras import ROTULOS_EXTRAS, regras_do_jogo
+from registro_modelos import impressao_digital
+from resultados import ler_resultado
+from utils.dados import carregar_dados, indice_combinacoes, ingerir_sorteios, obter_numeros
 
 jogo_selecionado = st.sidebar.selectbox("Selecione o jogo", list(configs_jogos.keys()))
 
@@ -82,6 +74,20 @@ if df is None:
 
 config = configs_jogos[jogo_selecionado]
 
+with st.sidebar.expander("Adicionar sorteios"):
+    arquivo_novos = st.file_uploader("CSV ou xlsx com os novos concursos", type=["csv", "xlsx"])
+    if arquivo_novos is not None and st.button("Anexar sorteios"):
+        try:
+            ingestao = ingerir_sorteios(jogo_selecionado, ler_planilha(arquivo_novos, arquivo_novos.name), config)
+        except Exception as e:
+            st.error(f"Erro ao anexar sorteios: {e}")
+        else:
+            if ingestao["novos"]:
+                st.success(f"{ingestao['novos']} sorteio(s) anexado(s).")
+                st.rerun()
+            else:
+                st.info("Nenhum concurso novo no arquivo.")
+
 aba = st.sidebar.selectbox("Selecione a aba", [
     "Exploração de Dados",
     "Sugestões Estatísticas",
@@ -92,118 +98,234 @@ aba = st.sidebar.selectbox("Selecione a aba", [
 
 bolas_df = obter_numeros(df)
 
+def grupo_da_sessao(*grupo):
+    # Os grupos de cancelamento são por sessão: a tabela de tarefas é do
+    # processo, e outra aba do navegador não deve cancelar os treinos desta.
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    contexto = get_script_run_ctx()
+    return (*grupo, contexto.session_id if contexto is not None else None)
+
+def aguardar_tarefa(tarefa, exibir_parciais=None):
+    # Treinos rodam em segundo plano (tarefas.py). Enquanto não terminam, só este
+    # fragmento é reexecutado a cada segundo, mostrando as épocas do MLP e os
+    # resultados parciais; ao terminar, a página inteira é recarregada.
+    from tarefas import CONCLUIDA, FALHOU
+
+    if tarefa.estado == CONCLUIDA:
+        return
+    if tarefa.estado == FALHOU:
+        st.error(f"Erro no treino: {tarefa.erro}")
+        exibir_perfil()
+        st.stop()
+
+    @st.fragment(run_every=1)
+    def acompanhar():
+        if tarefa.terminada:
+            st.rerun()
+        p = tarefa.progresso()
+        texto = f"Treinando... época {p['epocas']}/{p['max_iter']}"
+        if p["total_etapas"] > 1:
+            texto = f"Etapa {p['etapa'] + 1}/{p['total_etapas']} — {texto}"
+        if p["perda"] is not None:
+            texto += f" — perda {p['perda']:.4f}"
+        st.progress(p["fracao"], text=texto)
+        if exibir_parciais and tarefa.parciais:
+            exibir_parciais(list(tarefa.parciais))
+
+    acompanhar()
+    exibir_perfil()
+    st.stop()
+
+# Entradas do cache compartilhado de outras versões deste jogo são apagadas
+# quando a base muda; os resultados do batch.py são lidos desta versão exata.
+versao = versao_dados(jogo_selecionado)
+cache_padrao.invalidar(jogo_selecionado, versao)
+precalculado = ler_resultado(jogo_selecionado, versao)
+if precalculado and aba != "Exploração de Dados":
+    st.caption(f"Resultados pré-calculados em {precalculado['gerado_em']}.")
+
 if aba == "Exploração de Dados":
     st.title("Exploração de Dados")
-    exploracao_de_dados(df, jogo_selecionado, config)
-    estatisticas_soma(df)
+    from utils.graficos import estatisticas_soma, exploracao_de_dados
+
+    exploracao_de_dados(df, jogo_selecionado, config, versao=versao)
+    estatisticas_soma(df, jogo_selecionado, versao=versao)
 
 elif aba == "Sugestões Estatísticas":
     st.title("Sugestões Estatísticas")
-    freq_series = frequencia_numeros(df)
-    soma_jogos = bolas_df.sum(axis=1)
-    media_soma = soma_jogos.mean()
-    desvio_soma = soma_jogos.std()
-
-    sugestoes_est = gerar_multiplas_sugestoes_estatisticas(
-        freq_series, config["num_bolas"], media_soma, desvio_soma,
-        config["min_num"], config["max_num"], n_sugestoes=5
-    )
-    for i, s in enumerate(sugestoes_est):
-        acuracia = calcular_acuracia_sugestao(s, list(bolas_df.iloc[-1].values))
-        st.write(f"Estatística {i+1}: {s} — Acertos: {acuracia*100:.2f}%")
-
-elif aba == "Modelagem Neural Tradicional":
-    st.title("Modelagem Neural Tradicional (Regressor)")
-
-    # Ajuste para jogos especiais:
-    if jogo_selecionado == "Timemania":
-        numeros, time = gerar_jogo_timemania(config)
-        acuracia_neural = calcular_acuracia_sugestao(numeros, list(bolas_df.iloc[-1].values))
-        st.write(f"Sugestão Rede Neural: {numeros} — Acertos: {acuracia_neural*100:.2f}%")
-        st.write(f"Time do Coração sugerido: {time}")
-
-    elif jogo_selecionado == "Milionaria":
-        numeros, trevos = gerar_jogo_milionaria(config)
-        acuracia_neural = calcular_acuracia_sugestao(numeros, list(bolas_df.iloc[-1].values))
-        st.write(f"Sugestão Rede Neural: {numeros} — Acertos: {acuracia_neural*100:.2f}%")
-        st.write(f"Trevos sugeridos: {trevos}")
-
-    elif jogo_selecionado == "SuperSete":
-        numeros = gerar_jogo_supersete(config)
-        acuracia_neural = calcular_acuracia_sugestao(numeros, list(bolas_df.iloc[-1].values))
-        st.write(f"Sugestão Rede Neural: {numeros} — Acertos: {acuracia_neural*100:.2f}%")
+    from utils.estatisticas import sugestoes_estatisticas
 
+    sugestoes_est = precalculado["estatisticas"] if precalculado else sugestoes_estatisticas(df, config)
+    for i, s in enumerate(sugestoes_est):
+        st.write(f"Estatística {i+1}: {s['numeros']} — Acertos: {s['acuracia']*100:.2f}%")
+
+    # Quantas vezes cada sugestão teria feito 0..k acertos em todo o histórico
+    # (no SuperSete, acertos por coluna).
+    if sugestoes_est:
+        import pandas as pd
+
+        from utils.dados import pontuar_bilhetes
+
+        histograma = pontuar_bilhetes([s["numeros"] for s in sugestoes_est], bolas_df, config, histograma=True)
+        st.write("### Acertos das sugestões no histórico")
+        st.dataframe(pd.DataFrame(
+            histograma, columns=[f"{h} acertos" for h in range(histograma.shape[1])],
+            index=[f"Estatística {i+1}" for i in range(len(histograma))],
+        ))
+
+elif aba in ("Modelagem Neural Tradicional", "Modelagem Neural Multilabel"):
+    multilabel = aba == "Modelagem Neural Multilabel"
+    modelo = "mlp"
+    if multilabel:
+        from utils.neural import MODELOS_MULTILABEL, ROTULOS_MODELOS
+
+        st.title("Modelagem Neural Multilabel")
+        rotulo = "Sugestão Rede Neural Multilabel"
+        modelo = st.selectbox("Modelo", MODELOS_MULTILABEL, format_func=ROTULOS_MODELOS.get)
     else:
-        jogo_neural = gerar_jogo_neural(bolas_df, config)
-        if jogo_neural:
-            acuracia_neural = calcular_acuracia_sugestao(jogo_neural, list(bolas_df.iloc[-1].values))
-            jogo_neural_int = list(map(int, jogo_neural))
-            st.write(f"Sugestão Rede Neural: {jogo_neural_int} — Acertos: {acuracia_neural*100:.2f}%")
-
-elif aba == "Modelagem Neural Multilabel":
-    st.title("Modelagem Neural Multilabel")
-
-    if jogo_selecionado == "Timemania":
-        numeros, time = gerar_jogo_timemania(config)
-        acuracia_multi = calcular_acuracia_sugestao(numeros, list(bolas_df.iloc[-1].values))
-        st.write(f"Sugestão Rede Neural Multilabel: {numeros} — Acertos: {acuracia_multi*100:.2f}%")
-        st.write(f"Time do Coração sugerido: {time}")
-
-    elif jogo_selecionado == "Milionaria":
-        numeros, trevos = gerar_jogo_milionaria(config)
-        acuracia_multi = calcular_acuracia_sugestao(numeros, list(bolas_df.iloc[-1].values))
-        st.write(f"Sugestão Rede Neural Multilabel: {numeros} — Acertos: {acuracia_multi*100:.2f}%")
-        st.write(f"Trevos sugeridos: {trevos}")
-
-    elif jogo_selecionado == "SuperSete":
-        numeros = gerar_jogo_supersete(config)
-        acuracia_multi = calcular_acuracia_sugestao(numeros, list(bolas_df.iloc[-1].values))
-        st.write(f"Sugestão Rede Neural Multilabel: {numeros} — Acertos: {acuracia_multi*100:.2f}%")
+        st.title("Modelagem Neural Tradicional (Regressor)")
+        rotulo = "Sugestão Rede Neural"
 
+    # O batch.py pré-calcula só o MLP.
+    if precalculado and modelo == "mlp":
+        sugestao = precalculado["multilabel" if multilabel else "neural"]
     else:
-        jogo_neural_multi = gerar_jogo_neural_multilabel(bolas_df, config)
-        if jogo_neural_multi:
-            acuracia_multi = calcular_acuracia_sugestao(jogo_neural_multi, list(bolas_df.iloc[-1].values))
-            jogo_neural_multi_int = list(map(int, jogo_neural_multi))
-            st.write(f"Sugestão Rede Neural Multilabel: {jogo_neural_multi_int} — Acertos: {acuracia_multi*100:.2f}%")
+        from tarefas import agendador_padrao
+        from utils.neural import sugestao_neural
+
+        tarefa = agendador_padrao.submeter(
+            ("neural", jogo_selecionado, impressao_digital(bolas_df), multilabel, modelo),
+            sugestao_neural, jogo_selecionado, bolas_df, config, multilabel=multilabel, modelo=modelo, versao=versao,
+            grupo=grupo_da_sessao("neural", jogo_selecionado, multilabel),
+        )
+        aguardar_tarefa(tarefa)
+        sugestao = tarefa.resultado
+        if sugestao is None:
+            st.warning("Dados insuficientes para treino do modelo.")
+
+    if sugestao:
+        st.write(f"{rotulo}: {sugestao['numeros']} — Acertos: {sugestao['acuracia']*100:.2f}%")
+        for extra, rotulo_extra in ROTULOS_EXTRAS.items():
+            if extra in sugestao:
+                st.write(f"{rotulo_extra}: {sugestao[extra]}")
 
 elif aba == "Validação da Rede Neural":
     st.title("Validação Temporal da Rede Neural Multilabel")
-    n_validacoes = st.slider("Número de validações", 5, 30, 10)
-    resultados = validar_modelo_neural_multilabel(bolas_df, config, n_validacoes=n_validacoes)
+    from backtest import executar_backtest
+    from utils.estatisticas import cor_fundo_sugestao
+    from utils.neural import (
+        MODELOS_MULTILABEL, ROTULOS_MODELOS, comparar_modos_validacao, comparar_preditores, resultado_validacao,
+        validacao_neural,
+    )
 
-    historico_combinacoes = set(
-        tuple(sorted(bolas_df.iloc[i].values)) for i in range(len(bolas_df))
+    n_validacoes = st.slider("Número de validações", 5, 30, 10)
+    modelo = st.selectbox("Modelo", MODELOS_MULTILABEL, format_func=ROTULOS_MODELOS.get)
+    modo = st.radio(
+        "Modo de execução",
+        ["Re-treino completo", "Incremental (warm start)", "Paralelo (processos)"],
+        horizontal=True,
     )
 
+    # As comparações treinam dezenas de modelos: rodam em segundo plano como a
+    # validação, cada uma no seu grupo da sessão.
+    from tarefas import agendador_padrao
+
+    if st.checkbox("Comparar incremental × re-treino completo", value=False):
+        tarefa = agendador_padrao.submeter(
+            ("comparacao_modos", jogo_selecionado, impressao_digital(bolas_df), n_validacoes),
+            comparar_modos_validacao, bolas_df, config, n_validacoes=n_validacoes,
+            jogo=jogo_selecionado, versao=versao,
+            grupo=grupo_da_sessao("comparacao_modos", jogo_selecionado),
+        )
+        aguardar_tarefa(tarefa)
+        comparacao = tarefa.resultado
+        for nome, dados in comparacao.items():
+            st.write(f"- {nome}: {dados['tempo_s']:.2f}s — Acurácia média: {dados['acuracia_media']:.2f}%")
+
+    if st.checkbox("Comparar modelos (latência × acurácia)", value=False):
+        import pandas as pd
+
+        tarefa = agendador_padrao.submeter(
+            ("comparacao_preditores", jogo_selecionado, impressao_digital(bolas_df), n_validacoes),
+            comparar_preditores, bolas_df, config, n_validacoes=n_validacoes,
+            jogo=jogo_selecionado, versao=versao,
+            grupo=grupo_da_sessao("comparacao_preditores", jogo_selecionado),
+        )
+        aguardar_tarefa(tarefa)
+        comparacao = tarefa.resultado
+        st.dataframe(pd.DataFrame([
+            {
+                "Modelo": dados["rotulo"],
+                "Ajuste por janela (ms)": dados["ajuste_ms"],
+                "Predição (µs)": dados["predicao_us"],
+                "Predição sklearn (µs)": dados["predicao_sklearn_us"],
+                "Acurácia média (%)": dados["acuracia_media"],
+            }
+            for dados in comparacao.values()
+        ]), hide_index=True)
+
+    posicional = regras_do_jogo(config).posicional
+    historico_combinacoes = indice_combinacoes(bolas_df, posicional)
+
+    def exibir_resultados(resultados_formatados):
+        for res in resultados_formatados:
+            label_saida = " (Já saiu)" if res["ja_saiu"] else " (Ainda não saiu)"
+            acuracia_pct = res["acuracia"]
+            jogo_str = list(res['jogo_predito'])
+            bg_color = cor_fundo_sugestao(res["ja_saiu"], acuracia_pct)
+
+            texto = (
+                f"<div style='color: {bg_color}; padding: 8px; border-radius: 5px; margin-bottom: 5px;'>"
+                f"Validação -{res['indice']}: Predito: {jogo_str}, "
+                f"Acertos: {acuracia_pct:.2f}%{label_saida}"
+                "</div>"
+            )
+            st.markdown(texto, unsafe_allow_html=True)
+
+    area_resultados = st.empty()
     resultados_formatados = []
 
-    for i, (sugestao, acuracia) in enumerate(resultados):
-        numeros_preditos = sugestao["numeros"]
-        jogo_predito_int = tuple(sorted(map(int, numeros_preditos)))
-        ja_saiu = jogo_predito_int in historico_combinacoes
-        resultados_formatados.append({
-            "indice": n_validacoes - i,
-            "jogo_predito": jogo_predito_int,
-            "acuracia": acuracia,
-            "ja_saiu": ja_saiu
-        })
+    # O batch.py e o backtest em processos usam o MLP.
+    validacao_pronta = precalculado and precalculado["validacao"]["n_validacoes"] == n_validacoes and modelo == "mlp"
+    if validacao_pronta and modo == "Re-treino completo":
+        resultados_formatados = [
+            {**res, "jogo_predito": tuple(res["jogo_predito"])}
+            for res in precalculado["validacao"]["resultados"]
+        ]
+    elif modo == "Paralelo (processos)" and modelo == "mlp":
+        progresso = st.progress(0.0, text="Executando validações em paralelo...")
+        for indice, sugestao, acuracia in executar_backtest(
+            bolas_df, config, n_validacoes=n_validacoes, jogo=jogo_selecionado, versao=versao,
+        ):
+            resultados_formatados.append(resultado_validacao(indice, sugestao, acuracia, historico_combinacoes, posicional))
+            progresso.progress(len(resultados_formatados) / n_validacoes)
+            with area_resultados.container():
+                exibir_resultados(resultados_formatados)
+        progresso.empty()
+    else:
+        # Mudar o slider ou o modo no meio do treino cancela a validação anterior
+        # deste jogo (mesmo grupo) em vez de rodar dois fits ao mesmo tempo.
+        modo_validacao = "incremental" if modo == "Incremental (warm start)" else "completo"
+        tarefa = agendador_padrao.submeter(
+            ("validacao", jogo_selecionado, impressao_digital(bolas_df), n_validacoes, modo_validacao, modelo),
+            validacao_neural, jogo_selecionado, versao, bolas_df, config,
+            n_validacoes=n_validacoes, modo=modo_validacao, modelo=modelo,
+            grupo=grupo_da_sessao("validacao", jogo_selecionado),
+        )
 
-    resultados_formatados.sort(key=lambda x: (x["ja_saiu"], -x["acuracia"]))
+        def formatar(parciais):
+            formatados = [resultado_validacao(i, s, a, historico_combinacoes, posicional) for i, s, a in parciais]
+            return sorted(formatados, key=lambda x: (x["ja_saiu"], -x["acuracia"]))
 
-    for res in resultados_formatados:
-        label_saida = " (Já saiu)" if res["ja_saiu"] else " (Ainda não saiu)"
-        acuracia_pct = res["acuracia"]
-        jogo_str = list(res['jogo_predito'])
-        bg_color = cor_fundo_sugestao(res["ja_saiu"], acuracia_pct)
-
-        texto = (
-            f"<div style='color: {bg_color}; padding: 8px; border-radius: 5px; margin-bottom: 5px;'>"
-            f"Validação -{res['indice']}: Predito: {jogo_str}, "
-            f"Acertos: {acuracia_pct:.2f}%{label_saida}"
-            "</div>"
-        )
-        st.markdown(texto, unsafe_allow_html=True)
+        aguardar_tarefa(tarefa, lambda parciais: exibir_resultados(formatar(parciais)))
+        resultados_formatados = formatar(tarefa.parciais)
+
+    resultados_formatados.sort(key=lambda x: (x["ja_saiu"], -x["acuracia"]))
+    with area_resultados.container():
+        exibir_resultados(resultados_formatados)
 
     media = sum(r["acuracia"] for r in resultados_formatados) / len(resultados_formatados)
     st.markdown(f"**Acurácia média:** {media:.2f}%")
+
+exibir_perfil()
@@ -0,0 +1,244 @@
+import hashlib
+import json
+import os
+import time
+
+import pandas as pd
+
+from instrumentacao import medir
+
+# Cada base.xlsx é convertida uma única vez para Parquet; as leituras seguintes
+# evitam o parse do openpyxl. O cache é refeito quando o xlsx muda.
+# Sorteios novos podem ser anexados sem tocar no xlsx: cada lote vira um
+# arquivo delta-*.parquet ao lado da base e é concatenado na leitura.
+DIRETORIO_PAGINAS = "pages"
+DIRETORIO_COLUNAR = os.environ.get("LOTERICAS_CACHE_COLUNAR", os.path.join(".cache", "colunar"))
+NA_VALUES = ["-", "", " "]
+
+
+def caminho_xlsx(jogo):
+    pasta = os.path.join(DIRETORIO_PAGINAS, jogo)
+    if not os.path.isdir(pasta) and os.path.isdir(DIRETORIO_PAGINAS):
+        # A chave do jogo nem sempre tem a mesma caixa da pasta ("Timemania" x
+        # "TimeMania"), o que quebra em sistemas de arquivos case-sensitive.
+        for nome in os.listdir(DIRETORIO_PAGINAS):
+            if nome.lower() == jogo.lower():
+                pasta = os.path.join(DIRETORIO_PAGINAS, nome)
+                break
+    return os.path.join(pasta, "base.xlsx")
+
+
+def assinatura_xlsx(jogo):
+    info = os.stat(caminho_xlsx(jogo))
+    return info.st_mtime_ns, info.st_size
+
+
+def assinatura_dados(jogo):
+    # Muda quando o xlsx muda ou quando um delta é anexado.
+    _, _, caminho_meta = _caminhos_cache(jogo)
+    meta = _ler_meta(caminho_meta) or {}
+    return assinatura_xlsx(jogo), tuple(meta.get("deltas", []))
+
+
+def hash_arquivo(caminho, tamanho_bloco=1 << 20):
+    h = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def tipar_colunas(df):
+    for col in df.columns:
+        if "data" in col.lower():
+            df[col] = pd.to_datetime(df[col], errors="coerce", dayfirst=True)
+            df = df.set_index(col)
+            break
+    for col in df.columns:
+        temp = pd.to_numeric(df[col], errors="coerce")
+        if temp.notna().mean() > 0.9:
+            df[col] = temp.astype('Int64')
+    return df
+
+
+@medir
+def ler_xlsx(caminho):
+    return tipar_colunas(pd.read_excel(caminho, na_values=NA_VALUES))
+
+
+def ler_planilha(caminho, nome=None):
+    # `caminho` pode ser um arquivo aberto (ex.: upload do Streamlit); nesse caso
+    # o formato vem de `nome`.
+    if str(nome or caminho).lower().endswith(".csv"):
+        return tipar_colunas(pd.read_csv(caminho, sep=None, engine="python", na_values=NA_VALUES))
+    return ler_xlsx(caminho)
+
+
+def _normalizar_para_parquet(df):
+    # Colunas de texto com valores misturados (ex.: "R$ 1.000" e 1000.0) não são
+    # aceitas pelo Arrow; gravamos tudo como texto, preservando os nulos.
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True) not in ("string", "empty"):
+            df[col] = df[col].map(lambda v: v if pd.isna(v) else str(v))
+    return df
+
+
+def _caminhos_cache(jogo):
+    pasta = os.path.join(DIRETORIO_COLUNAR, jogo)
+    return pasta, os.path.join(pasta, "base.parquet"), os.path.join(pasta, "meta.json")
+
+
+def _ler_meta(caminho_meta):
+    try:
+        with open(caminho_meta, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _gravar_atomico(caminho, escrever):
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    escrever(temporario)
+    os.replace(temporario, caminho)
+
+
+def _gravar_meta(caminho_meta, meta):
+    def escrever(destino):
+        with open(destino, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+    _gravar_atomico(caminho_meta, escrever)
+
+
+def _gravar_parquet(caminho, df):
+    _gravar_atomico(caminho, lambda destino: _normalizar_para_parquet(df).to_parquet(destino))
+
+
+def versao_colunar(jogo):
+    _, _, caminho_meta = _caminhos_cache(jogo)
+    meta = _ler_meta(caminho_meta)
+    return meta["sha256"] if meta else None
+
+
+def versao_dados(jogo):
+    # Identifica o conteúdo completo (xlsx + deltas anexados) do cache colunar.
+    _, _, caminho_meta = _caminhos_cache(jogo)
+    meta = _ler_meta(caminho_meta)
+    if meta is None:
+        return None
+    h = hashlib.sha256(meta["sha256"].encode())
+    for nome in meta.get("deltas", []):
+        h.update(nome.encode())
+    return h.hexdigest()[:16]
+
+
+def _ler_deltas(pasta, meta):
+    return [pd.read_parquet(os.path.join(pasta, nome)) for nome in meta.get("deltas", [])]
+
+
+def _concatenar(base, deltas):
+    if not deltas:
+        return base
+    return pd.concat([base] + deltas)
+
+
+def _ultimo_concurso(df):
+    if "Concurso" not in df.columns or df.empty:
+        return None
+    return df["Concurso"].max()
+
+
+def converter_jogo(jogo):
+    pasta, caminho_parquet, caminho_meta = _caminhos_cache(jogo)
+    xlsx = caminho_xlsx(jogo)
+    mtime_ns, tamanho = assinatura_xlsx(jogo)
+    df = ler_xlsx(xlsx)
+    os.makedirs(pasta, exist_ok=True)
+
+    # Deltas anexados antes desta versão do xlsx continuam valendo apenas para
+    # concursos que a planilha nova ainda não traz.
+    meta_antiga = _ler_meta(caminho_meta) or {}
+    pendentes = _ler_deltas(pasta, meta_antiga)
+    ultimo = _ultimo_concurso(df)
+    if ultimo is not None:
+        pendentes = [d[d["Concurso"] > ultimo] for d in pendentes]
+    pendentes = [d for d in pendentes if not d.empty]
+
+    _gravar_parquet(caminho_parquet, df)
+    deltas = []
+    if pendentes:
+        nome = f"delta-{time.time_ns()}.parquet"
+        _gravar_parquet(os.path.join(pasta, nome), pd.concat(pendentes))
+        deltas.append(nome)
+    _gravar_meta(caminho_meta, {
+        "sha256": hash_arquivo(xlsx),
+        "mtime_ns": mtime_ns,
+        "tamanho": tamanho,
+        "deltas": deltas,
+    })
+    for nome in meta_antiga.get("deltas", []):
+        if nome not in deltas:
+            try:
+                os.remove(os.path.join(pasta, nome))
+            except OSError:
+                pass
+    return _concatenar(df, [pd.read_parquet(os.path.join(pasta, nome)) for nome in deltas])
+
+
+@medir
+def carregar_colunar(jogo):
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return ler_xlsx(caminho_xlsx(jogo))
+
+    pasta, caminho_parquet, caminho_meta = _caminhos_cache(jogo)
+    meta = _ler_meta(caminho_meta)
+    if meta is None or not os.path.exists(caminho_parquet):
+        return converter_jogo(jogo)
+
+    mtime_ns, tamanho = assinatura_xlsx(jogo)
+    if (meta["mtime_ns"], meta["tamanho"]) != (mtime_ns, tamanho):
+        # O mtime muda com um simples checkout; só reconvertemos se o conteúdo mudou.
+        if hash_arquivo(caminho_xlsx(jogo)) != meta["sha256"]:
+            return converter_jogo(jogo)
+        meta.update(mtime_ns=mtime_ns, tamanho=tamanho)
+        _gravar_meta(caminho_meta, meta)
+
+    return _concatenar(pd.read_parquet(caminho_parquet), _ler_deltas(pasta, meta))
+
+
+def anexar_colunar(jogo, novos):
+    # Anexa sorteios ao cache colunar e devolve (df completo, linhas realmente
+    # novas). Concursos já presentes são ignorados, então reenviar o mesmo
+    # arquivo não duplica sorteios.
+    atual = carregar_colunar(jogo)
+    pasta, _, caminho_meta = _caminhos_cache(jogo)
+    meta = _ler_meta(caminho_meta)
+    if meta is None:
+        raise RuntimeError("Anexar sorteios requer o cache colunar (instale pyarrow).")
+
+    faltando = [c for c in atual.columns if c not in novos.columns and ("Bola" in c or "Coluna" in c)]
+    if faltando:
+        raise ValueError(f"Colunas ausentes nos novos sorteios: {', '.join(faltando)}")
+    # A base é indexada pela data (tipar_colunas); sem ela o delta chegaria com
+    # um RangeIndex e misturaria inteiros ao índice de datas.
+    if atual.index.name is not None and novos.index.name != atual.index.name:
+        raise ValueError(f"Coluna ausente nos novos sorteios: {atual.index.name}")
+    novos = novos.reindex(columns=atual.columns)
+    for col in atual.columns:
+        if str(atual[col].dtype) == "Int64":
+            novos[col] = pd.to_numeric(novos[col], errors="coerce").astype("Int64")
+    novos.index.name = atual.index.name
+
+    ultimo = _ultimo_concurso(atual)
+    if ultimo is not None and "Concurso" in novos.columns:
+        novos = novos[novos["Concurso"] > ultimo]
+    if novos.empty:
+        return atual, novos
+
+    nome = f"delta-{time.time_ns()}.parquet"
+    _gravar_parquet(os.path.join(pasta, nome), novos)
+    meta["deltas"] = meta.get("deltas", []) + [nome]
+    _gravar_meta(caminho_meta, meta)
+    return pd.concat([atual, novos]), novos
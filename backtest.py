@@ -0,0 +1,82 @@
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Backtest paralelo: cada janela da validação walk-forward (e, opcionalmente,
+# cada jogo) vira uma tarefa independente num pool de processos. Os resultados
+# são devolvidos à medida que terminam, para a interface exibir cada janela
+# sem esperar o lote inteiro.
+MAX_WORKERS_PADRAO = int(os.environ.get("LOTERICAS_MAX_WORKERS", os.cpu_count() or 1))
+# Um fork do servidor do Streamlit copiaria travas seguradas por outras threads
+# (tarefas, cache, servidor de métricas); os workers partem de um processo
+# limpo.
+METODO_INICIO = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def semente_fold(semente_base, i):
+    return semente_base * 1_000_003 + i
+
+
+def _inicializar_worker():
+    # Com vários processos treinando ao mesmo tempo, o BLAS multithread de cada
+    # um só disputa os mesmos núcleos; limitamos a uma thread por worker.
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return
+    threadpool_limits(1)
+
+
+def _executar_fold(bolas_df, config, i, semente, jogo=None, versao=None):
+    from utils.neural import validar_fold_neural_multilabel
+
+    # Os sorteios auxiliares (trevos, time, mês) usam `random`; a semente por
+    # janela torna o resultado independente da ordem de execução no pool.
+    random.seed(semente)
+    sugestao, acuracia = validar_fold_neural_multilabel(bolas_df, config, i, jogo=jogo, versao=versao)
+    return i, sugestao, acuracia
+
+
+def _limitar_workers(max_workers, n_tarefas):
+    return max(1, min(max_workers or MAX_WORKERS_PADRAO, n_tarefas))
+
+
+def _pool(max_workers, n_tarefas):
+    return ProcessPoolExecutor(
+        max_workers=_limitar_workers(max_workers, n_tarefas), initializer=_inicializar_worker,
+        mp_context=multiprocessing.get_context(METODO_INICIO),
+    )
+
+
+def executar_backtest(bolas_df, config, n_validacoes=10, max_workers=None, semente_base=0, jogo=None, versao=None):
+    indices = range(n_validacoes, 0, -1)
+    with _pool(max_workers, n_validacoes) as executor:
+        futuros = [
+            executor.submit(_executar_fold, bolas_df, config, i, semente_fold(semente_base, i), jogo, versao)
+            for i in indices
+        ]
+        for futuro in as_completed(futuros):
+            yield futuro.result()
+
+
+def executar_backtest_jogos(dados_jogos, configs_jogos, n_validacoes=10, max_workers=None, semente_base=0, versoes=None):
+    # dados_jogos: {jogo: bolas_df}; os jogos sem dados são ignorados. versoes:
+    # {jogo: versao_dados(jogo)}, para marcar as entradas do cache compartilhado.
+    tarefas = [
+        (jogo, bolas_df, configs_jogos[jogo], i)
+        for jogo, bolas_df in dados_jogos.items() if bolas_df is not None
+        for i in range(n_validacoes, 0, -1)
+    ]
+    if not tarefas:
+        return
+    with _pool(max_workers, len(tarefas)) as executor:
+        futuros = {
+            executor.submit(
+                _executar_fold, bolas_df, config, i, semente_fold(semente_base, i), jogo, (versoes or {}).get(jogo),
+            ): jogo
+            for jogo, bolas_df, config, i in tarefas
+        }
+        for futuro in as_completed(futuros):
+            i, sugestao, acuracia = futuro.result()
+            yield futuros[futuro], i, sugestao, acuracia
@@ -0,0 +1,173 @@
+# Execução headless (sem Streamlit) de todo o pipeline: ingestão, treino dos
+# modelos, validação e sugestões para cada jogo de `configs_jogos`. Os
+# resultados são gravados por versão dos dados e lidos pelo app.py.
+#
+# Com --workers > 1, as janelas da validação de todos os jogos vão para um
+# único pool de processos antes do processamento de cada jogo.
+#
+# Uso: python batch.py [--jogos MegaSena Quina] [--anexar Quina=novos.csv] [--workers 8]
+import argparse
+import logging
+import sys
+import time
+from datetime import datetime
+
+from armazenamento import carregar_colunar, ler_planilha, versao_dados
+from backtest import executar_backtest, executar_backtest_jogos
+from cache_compartilhado import cache_padrao
+from instrumentacao import exportar_jsonl, zerar
+from jogos import configs_jogos
+from regras import regras_do_jogo
+from resultados import DIRETORIO_RESULTADOS, gravar_resultado
+from utils.dados import indice_combinacoes, ingerir_sorteios, obter_numeros
+from utils.estatisticas import sugestoes_estatisticas
+from utils.neural import resultado_validacao, sugestao_neural, validacao_neural
+
+logger = logging.getLogger("lotericas")
+
+
+def validar(jogo, bolas_df, config, n_validacoes, workers):
+    versao = versao_dados(jogo)
+    if workers > 1:
+        return list(executar_backtest(
+            bolas_df, config, n_validacoes=n_validacoes, max_workers=workers, jogo=jogo, versao=versao,
+        ))
+    resultados = validacao_neural(jogo, versao, bolas_df, config, n_validacoes=n_validacoes)
+    return [(n_validacoes - i, sugestao, acuracia) for i, (sugestao, acuracia) in enumerate(resultados)]
+
+
+def backtest_jogos(jogos, n_validacoes, workers):
+    # {jogo: [(i, sugestao, acuracia)]}; um jogo que não carrega fica de fora e
+    # falha de novo (e é contado) em processar_jogo.
+    dados = {}
+    for jogo in jogos:
+        try:
+            dados[jogo] = obter_numeros(carregar_colunar(jogo))
+        except Exception:
+            logger.exception("%s: falhou ao carregar para o backtest", jogo)
+    versoes = {jogo: versao_dados(jogo) for jogo in dados}
+    validacoes = {jogo: [] for jogo in dados}
+    for jogo, i, sugestao, acuracia in executar_backtest_jogos(
+        dados, configs_jogos, n_validacoes=n_validacoes, max_workers=workers, versoes=versoes,
+    ):
+        validacoes[jogo].append((i, sugestao, acuracia))
+    return validacoes
+
+
+def processar_jogo(jogo, config, n_validacoes=10, n_sugestoes=5, workers=1, validacoes=None):
+    tempos = {}
+    inicio = time.perf_counter()
+    df = carregar_colunar(jogo)
+    bolas_df = obter_numeros(df)
+    tempos["carga"] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    estatisticas = sugestoes_estatisticas(df, config, n_sugestoes=n_sugestoes)
+    tempos["estatisticas"] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    neural = sugestao_neural(jogo, bolas_df, config, versao=versao_dados(jogo))
+    tempos["neural"] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    multilabel = sugestao_neural(jogo, bolas_df, config, multilabel=True, versao=versao_dados(jogo))
+    tempos["multilabel"] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    posicional = regras_do_jogo(config).posicional
+    historico = indice_combinacoes(bolas_df, posicional)
+    validacoes = [
+        resultado_validacao(indice, sugestao, acuracia, historico, posicional)
+        for indice, sugestao, acuracia in (
+            validacoes if validacoes is not None else validar(jogo, bolas_df, config, n_validacoes, workers)
+        )
+    ]
+    validacoes.sort(key=lambda x: (x["ja_saiu"], -x["acuracia"]))
+    tempos["validacao"] = time.perf_counter() - inicio
+
+    return {
+        "jogo": jogo,
+        "versao_dados": versao_dados(jogo),
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "n_sorteios": len(bolas_df),
+        "estatisticas": estatisticas,
+        "neural": neural,
+        "multilabel": multilabel,
+        "validacao": {
+            "n_validacoes": n_validacoes,
+            "resultados": validacoes,
+            "acuracia_media": sum(r["acuracia"] for r in validacoes) / len(validacoes) if validacoes else 0.0,
+        },
+        "tempos_s": tempos,
+    }
+
+
+def _interpretar_anexos(anexos):
+    pares = []
+    for anexo in anexos:
+        jogo, sep, caminho = anexo.partition("=")
+        if not sep or jogo not in configs_jogos:
+            raise SystemExit(f"--anexar espera JOGO=ARQUIVO com um jogo válido, recebido: {anexo}")
+        pares.append((jogo, caminho))
+    return pares
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pré-calcula sugestões e validações para todos os jogos.")
+    parser.add_argument("--jogos", nargs="+", choices=list(configs_jogos), default=list(configs_jogos))
+    parser.add_argument("--anexar", action="append", default=[], metavar="JOGO=ARQUIVO",
+                        help="CSV/xlsx com concursos novos a anexar antes do processamento.")
+    parser.add_argument("--n-validacoes", type=int, default=10)
+    parser.add_argument("--n-sugestoes", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=1, help="Processos para a validação (1 = serial).")
+    parser.add_argument("--saida", default=DIRETORIO_RESULTADOS)
+    parser.add_argument("--perfil", metavar="ARQUIVO",
+                        help="Acrescenta ao JSONL os tempos por função de cada jogo (instrumentacao.py).")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    for jogo, caminho in _interpretar_anexos(args.anexar):
+        ingestao = ingerir_sorteios(jogo, ler_planilha(caminho), configs_jogos[jogo])
+        logger.info("%s: %d sorteio(s) anexado(s) de %s", jogo, ingestao["novos"], caminho)
+
+    validacoes = {}
+    if args.workers > 1:
+        inicio = time.perf_counter()
+        for jogo in args.jogos:
+            cache_padrao.invalidar(jogo, versao_dados(jogo))
+        try:
+            validacoes = backtest_jogos(args.jogos, args.n_validacoes, args.workers)
+        except Exception:
+            logger.exception("Backtest conjunto falhou; validando jogo a jogo")
+        else:
+            logger.info("Backtest de %d jogo(s): %.1fs", len(validacoes), time.perf_counter() - inicio)
+
+    falhas = 0
+    for jogo in args.jogos:
+        inicio = time.perf_counter()
+        zerar()
+        cache_padrao.invalidar(jogo, versao_dados(jogo))
+        try:
+            resultado = processar_jogo(
+                jogo, configs_jogos[jogo], n_validacoes=args.n_validacoes,
+                n_sugestoes=args.n_sugestoes, workers=args.workers, validacoes=validacoes.get(jogo),
+            )
+        except Exception:
+            logger.exception("%s: falhou", jogo)
+            falhas += 1
+            continue
+        finally:
+            if args.perfil:
+                exportar_jsonl(args.perfil, {"jogo": jogo})
+        if resultado["versao_dados"] is None:
+            logger.warning("%s: sem cache colunar (pyarrow ausente?); resultado não gravado", jogo)
+            continue
+        caminho = gravar_resultado(jogo, resultado["versao_dados"], resultado, diretorio=args.saida)
+        logger.info("%s: %.1fs -> %s", jogo, time.perf_counter() - inicio, caminho)
+
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+# Compara o tempo de carga a frio do xlsx (openpyxl) com o cache colunar.
+# Uso: python benchmarks/bench_carregamento.py [repeticoes]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from armazenamento import DIRETORIO_PAGINAS, caminho_xlsx, carregar_colunar, converter_jogo, ler_xlsx
+
+
+def medir(funcao, repeticoes):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    jogos = sorted(os.listdir(DIRETORIO_PAGINAS))
+
+    print(f"{'Jogo':<12} {'xlsx (ms)':>10} {'colunar (ms)':>13} {'ganho':>7}")
+    for jogo in jogos:
+        converter_jogo(jogo)
+        t_xlsx = medir(lambda: ler_xlsx(caminho_xlsx(jogo)), repeticoes)
+        t_colunar = medir(lambda: carregar_colunar(jogo), repeticoes)
+        print(f"{jogo:<12} {t_xlsx * 1000:>10.1f} {t_colunar * 1000:>13.1f} {t_xlsx / t_colunar:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# Histórico sintético grande em .npy int8 (historico_mapeado.py): grava os
+# sorteios direto de gerar_lotes, roda frequência, soma, pares, atrasos e
+# consulta ao histórico em blocos e mostra tempo e pico de memória alocada
+# (tracemalloc) de cada etapa. Com --verificar, compara com o caminho em
+# memória (MatrizSorteios/AnaliseCombinatoria/IndiceCombinacoes), que carrega
+# o histórico inteiro.
+# Uso: python benchmarks/bench_historico_mapeado.py [--jogo MegaSena] [--sorteios 5000000] [--verificar]
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import numpy as np  # noqa: E402
+
+from analise_combinatoria import AnaliseCombinatoria  # noqa: E402
+from geracao_lote import gerar_lote, gerar_lotes  # noqa: E402
+from historico_mapeado import TAMANHO_BLOCO_PADRAO, HistoricoMapeado, gravar_historico  # noqa: E402
+from indice_combinacoes import IndiceCombinacoes  # noqa: E402
+from jogos import configs_jogos  # noqa: E402
+from matriz_sorteios import MatrizSorteios  # noqa: E402
+from regras import regras_do_jogo  # noqa: E402
+
+
+def medir(rotulo, executar):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = executar()
+    tempo = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{rotulo:<28} {tempo:>9.2f} s {pico / 2**20:>10.1f} MiB")
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jogo", default="MegaSena", choices=list(configs_jogos))
+    parser.add_argument("--sorteios", type=int, default=5_000_000)
+    parser.add_argument("--bloco", type=int, default=TAMANHO_BLOCO_PADRAO)
+    parser.add_argument("--verificar", action="store_true")
+    args = parser.parse_args()
+
+    config = configs_jogos[args.jogo]
+    regras = regras_do_jogo(config)
+    diretorio = os.path.join(RAIZ, ".cache", "benchmarks")
+    os.makedirs(diretorio, exist_ok=True)
+    caminho = os.path.join(diretorio, f"{args.jogo}-{args.sorteios}.npy")
+    consultas = gerar_lote(config, 10_000, semente=1)["numeros"]
+
+    print(f"{'Etapa':<28} {'tempo':>11} {'pico':>14}")
+    medir("gravar", lambda: gravar_historico(
+        caminho, (lote["numeros"] for lote in gerar_lotes(config, args.sorteios, args.bloco, semente=0)),
+        args.sorteios, regras.num_bolas,
+    ))
+    historico = HistoricoMapeado(caminho, args.bloco)
+    analise = historico.analise(config)
+    frequencia = medir("frequência", lambda: historico.frequencia)
+    soma = medir("estatísticas da soma", historico.estatisticas_soma)
+    pares = medir("pares", lambda: analise.pares)
+    atrasos = medir("atrasos", lambda: analise.atraso_maximo)
+    ja_sairam = medir("10k consultas ao histórico", lambda: historico.contem_lote(consultas, regras.posicional))
+
+    if args.verificar:
+        bolas = np.load(caminho)
+        matriz = MatrizSorteios(bolas)
+        em_memoria = AnaliseCombinatoria(MatrizSorteios(regras.codificar(bolas), *regras.faixa_codigos))
+        indice = IndiceCombinacoes.de_matriz(matriz, posicional=regras.posicional)
+        iguais = (
+            np.array_equal(frequencia, matriz.frequencia) and soma == matriz.estatisticas_soma()
+            and np.array_equal(pares, em_memoria.pares) and np.array_equal(atrasos, em_memoria.atraso_maximo)
+            and np.array_equal(ja_sairam, indice.contem_lote(consultas))
+        )
+        print("Resultados idênticos ao caminho em memória:", iguais)
+        if not iguais:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# Orçamento de tempo de importação dos submódulos de `utils`. Cada módulo é
+# importado num processo novo com `python -X importtime`; o script falha se o
+# tempo cumulativo passar do orçamento ou se o módulo puxar uma dependência
+# pesada que não deveria (ex.: scikit-learn ao carregar só os dados).
+# Uso: python benchmarks/bench_importacao.py [repeticoes]
+# LOTERICAS_IMPORTTIME_FATOR multiplica os orçamentos em máquinas mais lentas.
+import os
+import re
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FATOR = float(os.environ.get("LOTERICAS_IMPORTTIME_FATOR", "1"))
+
+PESADOS = ("streamlit", "sklearn", "matplotlib", "pandas")
+
+# modulo: (orçamento em ms, dependências que não podem ser carregadas)
+ORCAMENTOS = {
+    "utils": (50, PESADOS),
+    "utils.dados": (800, ("streamlit", "sklearn", "matplotlib")),
+    "utils.estatisticas": (800, ("streamlit", "sklearn", "matplotlib")),
+    "utils.geracao": (800, ("streamlit", "sklearn", "matplotlib")),
+    "utils.neural": (2500, ("streamlit", "matplotlib")),
+    "utils.graficos": (3000, ("streamlit", "sklearn")),
+    "batch": (3000, ("streamlit", "matplotlib")),
+}
+
+
+def medir(modulo):
+    codigo = f"import sys, {modulo}; print(','.join(m for m in {PESADOS!r} if m in sys.modules))"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=RAIZ, capture_output=True, text=True, check=True,
+    )
+    padrao = re.compile(rf"import time:\s+\d+ \|\s+(\d+) \| {re.escape(modulo)}$")
+    cumulativo = max(int(m.group(1)) for m in map(padrao.match, proc.stderr.splitlines()) if m)
+    carregados = [m for m in proc.stdout.strip().split(",") if m]
+    return cumulativo / 1000, carregados
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    falhas = []
+    print(f"{'Módulo':<20} {'ms':>8} {'orçamento':>10}  dependências pesadas")
+    for modulo, (orcamento, proibidos) in ORCAMENTOS.items():
+        medicoes = [medir(modulo) for _ in range(repeticoes)]
+        tempo = min(t for t, _ in medicoes)
+        carregados = medicoes[0][1]
+        limite = orcamento * FATOR
+        print(f"{modulo:<20} {tempo:>8.1f} {limite:>10.0f}  {', '.join(carregados) or '-'}")
+        if tempo > limite:
+            falhas.append(f"{modulo}: {tempo:.1f} ms > {limite:.0f} ms")
+        indevidos = sorted(set(carregados) & set(proibidos))
+        if indevidos:
+            falhas.append(f"{modulo} importou {', '.join(indevidos)}")
+
+    for falha in falhas:
+        print(f"FALHA: {falha}")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
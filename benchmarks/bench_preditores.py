@@ -0,0 +1,36 @@
+# Compara os modelos do multilabel lado a lado: ajuste por janela, latência de
+# uma predição e acurácia média da validação walk-forward (comparar_preditores).
+# Uso: python benchmarks/bench_preditores.py [n_validacoes] [jogo ...]
+import os
+import sys
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jogos import configs_jogos
+from utils.dados import carregar_dados, obter_numeros
+from utils.neural import comparar_preditores
+
+
+def main():
+    n_validacoes = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    jogos = sys.argv[2:] or ["MegaSena", "Quina", "LotoFacil"]
+    warnings.filterwarnings("ignore", module="sklearn")
+
+    print(f"{'Jogo':<12} {'Modelo':<42} {'ajuste (ms)':>12} {'predição (µs)':>14} {'sklearn (µs)':>13} {'acurácia':>9}")
+    for jogo in jogos:
+        df = carregar_dados(jogo)
+        if df is None:
+            continue
+        comparacao = comparar_preditores(obter_numeros(df), configs_jogos[jogo], n_validacoes=n_validacoes)
+        for dados in comparacao.values():
+            sklearn = f"{dados['predicao_sklearn_us']:.0f}" if dados["predicao_sklearn_us"] is not None else "-"
+            print(
+                f"{jogo:<12} {dados['rotulo']:<42} {dados['ajuste_ms']:>12.1f} {dados['predicao_us']:>14.0f}"
+                f" {sklearn:>13} {dados['acuracia_media']:>8.2f}%"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+# Suíte de benchmarks headless do pipeline de análise e modelagem. Roda sobre
+# as bases de `pages/*/base.xlsx` e sobre históricos sintéticos 10x/100x maiores
+# (a base real mais sorteios gerados anexados como delta no cache colunar).
+# Cada execução é acrescentada ao histórico em JSONL e comparada com a linha
+# de base; o script sai com código 1 se algum caso ficou mais lento que a base
+# além da tolerância.
+#
+# Uso:
+#   python benchmarks/suite.py                       # todos os jogos, escalas 1,10,100
+#   python benchmarks/suite.py --jogos Quina --escalas 1 --casos carregar_dados
+#   python benchmarks/suite.py --gravar-base         # grava os tempos como nova base
+#
+# Os casos neurais treinam MLPs de verdade e ficam limitados a 10x por padrão
+# (--escala-neural-max); a validação usa poucas janelas (--n-validacoes).
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import warnings
+from datetime import datetime
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIRETORIO_BENCHMARKS = os.environ.get("LOTERICAS_BENCHMARKS", os.path.join(".cache", "benchmarks"))
+TRABALHO = os.path.join(DIRETORIO_BENCHMARKS, "trabalho")
+
+# Caches isolados: os modelos são sempre treinados, a base colunar é própria
+# de cada escala e o cache compartilhado (validações, entradas) fica desligado.
+os.chdir(RAIZ)
+os.environ["LOTERICAS_CACHE_MODELOS"] = os.path.join(TRABALHO, "modelos")
+os.environ["LOTERICAS_CACHE_COMPARTILHADO"] = "desligado"
+sys.path.insert(0, RAIZ)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import armazenamento  # noqa: E402
+from geracao_lote import gerar_lote  # noqa: E402
+from jogos import configs_jogos  # noqa: E402
+from registro_modelos import registro_padrao  # noqa: E402
+from utils import dados  # noqa: E402
+from utils.dados import carregar_dados, frequencia_numeros, matriz_sorteios, obter_numeros, pontuar_bilhetes  # noqa: E402
+from utils.estatisticas import gerar_multiplas_sugestoes_estatisticas  # noqa: E402
+
+ESCALAS_PADRAO = (1, 10, 100)
+TOLERANCIA_PADRAO = 0.25
+# Diferenças abaixo disso são ruído de medição, mesmo que a razão seja grande.
+FOLGA_ABSOLUTA_S = 0.002
+TEMPO_ALVO_S = 1.0
+REPETICOES_MIN = 3
+REPETICOES_MAX = 50
+
+
+def _versao(pacote):
+    try:
+        from importlib import metadata
+        return metadata.version(pacote)
+    except Exception:
+        return None
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def ambiente():
+    return {
+        "commit": _commit(),
+        "maquina": platform.node(),
+        "python": platform.python_version(),
+        "numpy": _versao("numpy"),
+        "pandas": _versao("pandas"),
+        "scikit-learn": _versao("scikit-learn"),
+    }
+
+
+# Históricos sintéticos
+def sorteios_sinteticos(df, config, n, semente):
+    # Gera n concursos depois do último da base, com as mesmas colunas de bolas.
+    # Jogos com mais colunas que num_bolas (DuplaSena: dois sorteios por
+    # concurso) recebem lotes independentes lado a lado.
+    colunas = list(obter_numeros(df).columns)
+    rng = np.random.default_rng(semente)
+    blocos = []
+    while sum(b.shape[1] for b in blocos) < len(colunas):
+        blocos.append(gerar_lote(config, n, rng=rng)["numeros"])
+    bolas = np.hstack(blocos)[:, :len(colunas)]
+
+    novos = pd.DataFrame(bolas.astype("int64"), columns=colunas)
+    ultimo = int(df["Concurso"].max()) if "Concurso" in df.columns else len(df)
+    novos.insert(0, "Concurso", np.arange(ultimo + 1, ultimo + 1 + n))
+    inicio = df.index.max() if isinstance(df.index, pd.DatetimeIndex) else pd.Timestamp("2000-01-01")
+    novos.index = pd.date_range(inicio + pd.Timedelta(days=1), periods=n, freq="D", name=df.index.name)
+    return novos
+
+
+def preparar_escala(jogo, config, escala):
+    # Cada escala tem seu próprio diretório colunar; a escala 1 é a base real e
+    # as demais anexam (escala - 1) vezes o tamanho da base em sorteios sintéticos.
+    armazenamento.DIRETORIO_COLUNAR = os.path.join(TRABALHO, "colunar", f"{escala}x")
+    df = armazenamento.carregar_colunar(jogo)
+    # Sem deltas, a base ainda não foi estendida (nas execuções seguintes os
+    # sorteios sintéticos já estão no cache e são reaproveitados).
+    if escala > 1 and not armazenamento.assinatura_dados(jogo)[1]:
+        novos = sorteios_sinteticos(df, config, (escala - 1) * len(df), semente=escala)
+        df, _ = armazenamento.anexar_colunar(jogo, novos)
+    return df
+
+
+# Casos
+def _limpar_derivados():
+    with dados._trava_derivados:
+        dados._derivados.clear()
+
+
+def _semear():
+    random.seed(0)
+    np.random.seed(0)
+
+
+def caso_carregar_dados(jogo, config, df, args):
+    return lambda: carregar_dados(jogo), None
+
+
+def caso_frequencia_numeros(jogo, config, df, args):
+    return lambda: frequencia_numeros(df), _limpar_derivados
+
+
+def caso_sugestoes_estatisticas(jogo, config, df, args):
+    matriz = matriz_sorteios(df)
+    media_soma, desvio_soma = matriz.estatisticas_soma()
+    freq = matriz.serie_frequencia()
+    return lambda: gerar_multiplas_sugestoes_estatisticas(
+        freq, config["num_bolas"], media_soma, desvio_soma, config["min_num"], config["max_num"], n_sugestoes=5,
+    ), None
+
+
+def caso_pontuar_bilhetes(jogo, config, df, args):
+    bolas_df = obter_numeros(df)
+    bilhetes = gerar_lote(config, 10_000, semente=0)["numeros"]
+    return lambda: pontuar_bilhetes(bilhetes, bolas_df, config, histograma=True), None
+
+
+def caso_gerar_jogo_neural(jogo, config, df, args):
+    from utils.neural import gerar_jogo_neural
+    bolas_df = obter_numeros(df)
+    return lambda: gerar_jogo_neural(bolas_df, config), registro_padrao.limpar
+
+
+def caso_gerar_jogo_neural_multilabel(jogo, config, df, args):
+    from utils.neural import gerar_jogo_neural_multilabel
+    bolas_df = obter_numeros(df)
+    return lambda: gerar_jogo_neural_multilabel(bolas_df, config), registro_padrao.limpar
+
+
+def caso_validar_modelo_neural_multilabel(jogo, config, df, args):
+    from utils.neural import validar_modelo_neural_multilabel
+    bolas_df = obter_numeros(df)
+    return lambda: validar_modelo_neural_multilabel(bolas_df, config, n_validacoes=args.n_validacoes), None
+
+
+# nome: (preparo, caso neural?)
+CASOS = {
+    "carregar_dados": (caso_carregar_dados, False),
+    "frequencia_numeros": (caso_frequencia_numeros, False),
+    "gerar_multiplas_sugestoes_estatisticas": (caso_sugestoes_estatisticas, False),
+    "pontuar_bilhetes": (caso_pontuar_bilhetes, False),
+    "gerar_jogo_neural": (caso_gerar_jogo_neural, True),
+    "gerar_jogo_neural_multilabel": (caso_gerar_jogo_neural_multilabel, True),
+    "validar_modelo_neural_multilabel": (caso_validar_modelo_neural_multilabel, True),
+}
+
+
+def cronometrar(executar, limpar, repeticoes_max):
+    # Repete até somar TEMPO_ALVO_S (no mínimo REPETICOES_MIN vezes, salvo
+    # casos que sozinhos já passam do alvo, como os treinos).
+    tempos = []
+    while len(tempos) < repeticoes_max:
+        if limpar is not None:
+            limpar()
+        _semear()
+        inicio = time.perf_counter()
+        executar()
+        tempos.append(time.perf_counter() - inicio)
+        if sum(tempos) >= TEMPO_ALVO_S and (len(tempos) >= REPETICOES_MIN or tempos[0] >= TEMPO_ALVO_S):
+            break
+    return tempos
+
+
+def chave(resultado):
+    return f"{resultado['caso']}|{resultado['jogo']}|{resultado['escala']}"
+
+
+def ler_base(caminho):
+    try:
+        with open(caminho, encoding="utf-8") as f:
+            return json.load(f)["resultados"]
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def gravar_base(caminho, resultados, contexto):
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    base = ler_base(caminho)
+    base.update({chave(r): r for r in resultados})
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump({"ambiente": contexto, "resultados": base}, f, indent=1, ensure_ascii=False)
+
+
+def comparar(resultado, base, tolerancia):
+    anterior = base.get(chave(resultado))
+    if anterior is None:
+        return None, False
+    razao = resultado["melhor_s"] / anterior["melhor_s"] if anterior["melhor_s"] else float("inf")
+    regressao = (
+        razao > 1 + tolerancia
+        and resultado["melhor_s"] - anterior["melhor_s"] > FOLGA_ABSOLUTA_S
+    )
+    return razao, regressao
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do pipeline com histórico e detecção de regressões.")
+    parser.add_argument("--jogos", nargs="+", choices=list(configs_jogos), default=list(configs_jogos))
+    parser.add_argument("--casos", nargs="+", choices=list(CASOS), default=list(CASOS))
+    parser.add_argument("--escalas", default=",".join(map(str, ESCALAS_PADRAO)),
+                        help="Fatores de tamanho do histórico, separados por vírgula.")
+    parser.add_argument("--escala-neural-max", type=int, default=10)
+    parser.add_argument("--n-validacoes", type=int, default=3)
+    parser.add_argument("--repeticoes-max", type=int, default=REPETICOES_MAX)
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA_PADRAO,
+                        help="Aumento relativo aceito antes de acusar regressão (0.25 = 25%%).")
+    parser.add_argument("--historico", default=os.path.join(DIRETORIO_BENCHMARKS, "historico.jsonl"))
+    parser.add_argument("--base", default=os.path.join(DIRETORIO_BENCHMARKS, "linha_de_base.json"))
+    parser.add_argument("--gravar-base", action="store_true", help="Grava os tempos desta execução como base.")
+    parser.add_argument("--limpar", action="store_true", help="Apaga os históricos sintéticos gerados antes.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR)
+    warnings.filterwarnings("ignore", message="Stochastic Optimizer")
+    if args.limpar:
+        shutil.rmtree(TRABALHO, ignore_errors=True)
+    escalas = [int(e) for e in args.escalas.split(",") if e.strip()]
+    contexto = {**ambiente(), "executado_em": datetime.now().isoformat(timespec="seconds")}
+    base = ler_base(args.base)
+
+    resultados = []
+    regressoes = []
+    print(f"{'Caso':<40} {'Jogo':<11} {'Escala':>6} {'Sorteios':>9} {'ms':>10} {'base':>10} {'razão':>7}")
+    for escala in escalas:
+        for jogo in args.jogos:
+            config = configs_jogos[jogo]
+            df = preparar_escala(jogo, config, escala)
+            for nome in args.casos:
+                preparar, neural = CASOS[nome]
+                if neural and escala > args.escala_neural_max:
+                    continue
+                executar, limpar = preparar(jogo, config, df, args)
+                repeticoes_max = 1 if neural else args.repeticoes_max
+                tempos = cronometrar(executar, limpar, repeticoes_max)
+                resultado = {
+                    "caso": nome, "jogo": jogo, "escala": escala, "n_sorteios": len(df),
+                    "melhor_s": min(tempos), "mediana_s": statistics.median(tempos), "repeticoes": len(tempos),
+                }
+                resultados.append(resultado)
+
+                razao, regressao = comparar(resultado, base, args.tolerancia)
+                anterior = base.get(chave(resultado))
+                print(
+                    f"{nome:<40} {jogo:<11} {escala:>5}x {len(df):>9} {resultado['melhor_s'] * 1000:>10.1f} "
+                    f"{anterior['melhor_s'] * 1000 if anterior else float('nan'):>10.1f} "
+                    f"{razao if razao is not None else float('nan'):>6.2f}x"
+                    f"{'  REGRESSÃO' if regressao else ''}",
+                    flush=True,
+                )
+                if regressao:
+                    regressoes.append(resultado)
+
+    os.makedirs(os.path.dirname(args.historico) or ".", exist_ok=True)
+    with open(args.historico, "a", encoding="utf-8") as f:
+        for resultado in resultados:
+            f.write(json.dumps({**contexto, **resultado}, ensure_ascii=False) + "\n")
+    if args.gravar_base:
+        gravar_base(args.base, resultados, contexto)
+        print(f"Linha de base gravada em {args.base}")
+
+    for r in regressoes:
+        print(f"REGRESSÃO: {r['caso']} / {r['jogo']} / {r['escala']}x")
+    return 1 if regressoes and not args.gravar_base else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
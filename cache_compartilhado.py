@@ -0,0 +1,335 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from instrumentacao import registrar_cache
+
+# Cache compartilhado por todos os processos do host (réplicas do Streamlit,
+# batch.py, workers do backtest). Cada entrada tem um espaço (ex.: "modelos",
+# "validacao"), uma chave, o valor em pickle, o último acesso, uma expiração
+# opcional (TTL) e, quando faz sentido, o jogo e a versão dos dados
+# (versao_dados) a que pertence. `invalidar(jogo, versao)` apaga as entradas de
+# outras versões do jogo; acima de `max_bytes` as entradas usadas há mais
+# tempo são despejadas.
+#
+# Backends, escolhidos por uma especificação (ex.: LOTERICAS_CACHE_COMPARTILHADO):
+#   "sqlite:<arquivo>"     um arquivo SQLite (WAL), bom para muitas entradas pequenas;
+#   "arquivos:<diretório>" um pickle por entrada, bom para objetos grandes (modelos);
+#   "<diretório>"          o mesmo que "arquivos:<diretório>";
+#   "desligado"            nada é guardado.
+ESPECIFICACAO_PADRAO = os.environ.get(
+    "LOTERICAS_CACHE_COMPARTILHADO", "sqlite:" + os.path.join(".cache", "compartilhado.sqlite3")
+)
+MAX_BYTES_PADRAO = int(os.environ.get("LOTERICAS_CACHE_MAX_MB", "512")) * 1024 * 1024
+
+
+class CacheCompartilhado:
+    def __init__(self, max_bytes=MAX_BYTES_PADRAO):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.despejos = 0
+        self._versoes_vistas = {}
+
+    def obter(self, espaco, chave):
+        raise NotImplementedError
+
+    def guardar(self, espaco, chave, valor, ttl=None, jogo=None, versao=None):
+        raise NotImplementedError
+
+    def remover(self, espaco, chave):
+        raise NotImplementedError
+
+    def _invalidar(self, jogo, versao):
+        raise NotImplementedError
+
+    def limpar(self, espaco=None):
+        raise NotImplementedError
+
+    def tamanho_bytes(self):
+        raise NotImplementedError
+
+    def obter_ou_calcular(self, espaco, chave, calcular, ttl=None, jogo=None, versao=None):
+        valor = self.obter(espaco, chave)
+        if valor is None:
+            valor = calcular()
+            self.guardar(espaco, chave, valor, ttl=ttl, jogo=jogo, versao=versao)
+        return valor
+
+    def invalidar(self, jogo, versao):
+        # Chamado a cada leitura da base (ex.: a cada rerun); só vai ao backend
+        # quando este processo vê uma versão nova do jogo.
+        if versao is None or self._versoes_vistas.get(jogo) == versao:
+            return
+        self._invalidar(jogo, versao)
+        self._versoes_vistas[jogo] = versao
+
+    def _contar(self, valor):
+        registrar_cache(valor is not None)
+        if valor is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return valor
+
+    def estatisticas(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "despejos": self.despejos,
+            "taxa_acerto": self.hits / total if total else 0.0,
+            "bytes": self.tamanho_bytes(),
+        }
+
+
+def _expira_em(ttl):
+    return time.time() + ttl if ttl is not None else None
+
+
+class CacheSQLite(CacheCompartilhado):
+    def __init__(self, caminho, max_bytes=MAX_BYTES_PADRAO):
+        super().__init__(max_bytes)
+        self.caminho = caminho
+        self._local = threading.local()
+
+    def _conexao(self):
+        # sqlite3 não compartilha conexões entre threads (nem entre processos
+        # após um fork): uma por thread e processo, aberta no primeiro uso.
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is None or self._local.pid != os.getpid():
+            pasta = os.path.dirname(self.caminho)
+            if pasta:
+                os.makedirs(pasta, exist_ok=True)
+            conexao = sqlite3.connect(self.caminho, timeout=30)
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.execute("PRAGMA synchronous=NORMAL")
+            with conexao:
+                conexao.execute(
+                    "CREATE TABLE IF NOT EXISTS entradas ("
+                    " espaco TEXT NOT NULL, chave TEXT NOT NULL, valor BLOB NOT NULL,"
+                    " tamanho INTEGER NOT NULL, acesso REAL NOT NULL, expira REAL,"
+                    " jogo TEXT, versao TEXT, PRIMARY KEY (espaco, chave))"
+                )
+                conexao.execute("CREATE INDEX IF NOT EXISTS entradas_acesso ON entradas (acesso)")
+                conexao.execute("CREATE INDEX IF NOT EXISTS entradas_jogo ON entradas (jogo, versao)")
+            self._local.conexao = conexao
+            self._local.pid = os.getpid()
+        return conexao
+
+    def obter(self, espaco, chave):
+        conexao = self._conexao()
+        linha = conexao.execute(
+            "SELECT valor, expira FROM entradas WHERE espaco = ? AND chave = ?", (espaco, chave)
+        ).fetchone()
+        if linha is None:
+            return self._contar(None)
+        dados, expira = linha
+        agora = time.time()
+        try:
+            valor = None if expira is not None and expira <= agora else pickle.loads(dados)
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            valor = None
+        with conexao:
+            if valor is None:
+                conexao.execute("DELETE FROM entradas WHERE espaco = ? AND chave = ?", (espaco, chave))
+            else:
+                conexao.execute("UPDATE entradas SET acesso = ? WHERE espaco = ? AND chave = ?", (agora, espaco, chave))
+        return self._contar(valor)
+
+    def guardar(self, espaco, chave, valor, ttl=None, jogo=None, versao=None):
+        dados = pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(dados) > self.max_bytes:
+            return
+        conexao = self._conexao()
+        with conexao:
+            conexao.execute(
+                "INSERT OR REPLACE INTO entradas VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (espaco, chave, sqlite3.Binary(dados), len(dados), time.time(), _expira_em(ttl), jogo, versao),
+            )
+            self._despejar(conexao)
+
+    def _despejar(self, conexao):
+        conexao.execute("DELETE FROM entradas WHERE expira IS NOT NULL AND expira <= ?", (time.time(),))
+        # Mantém as entradas mais recentes cuja soma cabe em max_bytes.
+        cursor = conexao.execute(
+            "DELETE FROM entradas WHERE rowid IN ("
+            " SELECT rowid FROM (SELECT rowid, SUM(tamanho) OVER (ORDER BY acesso DESC, rowid DESC) AS acumulado"
+            " FROM entradas) WHERE acumulado > ?)",
+            (self.max_bytes,),
+        )
+        self.despejos += max(cursor.rowcount, 0)
+
+    def remover(self, espaco, chave):
+        conexao = self._conexao()
+        with conexao:
+            conexao.execute("DELETE FROM entradas WHERE espaco = ? AND chave = ?", (espaco, chave))
+
+    def _invalidar(self, jogo, versao):
+        conexao = self._conexao()
+        with conexao:
+            conexao.execute("DELETE FROM entradas WHERE jogo = ? AND versao IS NOT NULL AND versao != ?", (jogo, versao))
+
+    def limpar(self, espaco=None):
+        conexao = self._conexao()
+        with conexao:
+            if espaco is None:
+                conexao.execute("DELETE FROM entradas")
+            else:
+                conexao.execute("DELETE FROM entradas WHERE espaco = ?", (espaco,))
+
+    def tamanho_bytes(self):
+        return self._conexao().execute("SELECT COALESCE(SUM(tamanho), 0) FROM entradas").fetchone()[0]
+
+
+class CacheArquivos(CacheCompartilhado):
+    # <diretório>/<espaço>/<hash da chave>.pkl com dois pickles seguidos: o
+    # cabeçalho (chave, expiração, jogo, versão) e o valor, para que TTL e
+    # invalidação leiam só o cabeçalho. O último acesso é o mtime do arquivo.
+    def __init__(self, diretorio, max_bytes=MAX_BYTES_PADRAO):
+        super().__init__(max_bytes)
+        self.diretorio = diretorio
+
+    def _caminho(self, espaco, chave):
+        nome = hashlib.sha256(chave.encode()).hexdigest()[:32]
+        return os.path.join(self.diretorio, espaco, f"{nome}.pkl")
+
+    def _arquivos(self, espaco=None):
+        espacos = [espaco] if espaco is not None else []
+        if espaco is None and os.path.isdir(self.diretorio):
+            espacos = [n for n in os.listdir(self.diretorio) if os.path.isdir(os.path.join(self.diretorio, n))]
+        for nome in espacos:
+            try:
+                with os.scandir(os.path.join(self.diretorio, nome)) as entradas:
+                    for entrada in entradas:
+                        if entrada.name.endswith(".pkl"):
+                            yield entrada
+            except OSError:
+                continue
+
+    def obter(self, espaco, chave):
+        caminho = self._caminho(espaco, chave)
+        try:
+            with open(caminho, "rb") as f:
+                cabecalho = pickle.load(f)
+                expirado = cabecalho["expira"] is not None and cabecalho["expira"] <= time.time()
+                if cabecalho["chave"] != chave or expirado:
+                    valor = None
+                else:
+                    valor = pickle.load(f)
+        except OSError:
+            return self._contar(None)
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, KeyError, TypeError):
+            valor = None
+        if valor is None:
+            self._remover_arquivo(caminho)
+            return self._contar(None)
+        try:
+            os.utime(caminho)
+        except OSError:
+            pass
+        return self._contar(valor)
+
+    def guardar(self, espaco, chave, valor, ttl=None, jogo=None, versao=None):
+        caminho = self._caminho(espaco, chave)
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+        cabecalho = {"chave": chave, "expira": _expira_em(ttl), "jogo": jogo, "versao": versao}
+        with open(temporario, "wb") as f:
+            pickle.dump(cabecalho, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(valor, f, protocol=pickle.HIGHEST_PROTOCOL)
+        # Uma entrada maior que o limite despejaria todas as outras; não é guardada.
+        if os.path.getsize(temporario) > self.max_bytes:
+            self._remover_arquivo(temporario)
+            return
+        os.replace(temporario, caminho)
+        self._despejar()
+
+    def _despejar(self):
+        arquivos = []
+        for entrada in self._arquivos():
+            try:
+                estado = entrada.stat()
+            except OSError:
+                continue
+            arquivos.append((estado.st_mtime_ns, estado.st_size, entrada.path))
+        total = sum(tamanho for _, tamanho, _ in arquivos)
+        arquivos.sort()
+        for _, tamanho, caminho in arquivos:
+            if total <= self.max_bytes:
+                break
+            if self._remover_arquivo(caminho):
+                self.despejos += 1
+            total -= tamanho
+
+    def _remover_arquivo(self, caminho):
+        try:
+            os.remove(caminho)
+            return True
+        except OSError:
+            return False
+
+    def remover(self, espaco, chave):
+        self._remover_arquivo(self._caminho(espaco, chave))
+
+    def _invalidar(self, jogo, versao):
+        for entrada in self._arquivos():
+            try:
+                with open(entrada.path, "rb") as f:
+                    cabecalho = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+                continue
+            if not isinstance(cabecalho, dict):
+                continue
+            if cabecalho.get("jogo") == jogo and cabecalho.get("versao") not in (None, versao):
+                self._remover_arquivo(entrada.path)
+
+    def limpar(self, espaco=None):
+        for entrada in self._arquivos(espaco):
+            self._remover_arquivo(entrada.path)
+
+    def tamanho_bytes(self):
+        total = 0
+        for entrada in self._arquivos():
+            try:
+                total += entrada.stat().st_size
+            except OSError:
+                pass
+        return total
+
+
+class CacheDesligado(CacheCompartilhado):
+    def obter(self, espaco, chave):
+        return self._contar(None)
+
+    def guardar(self, espaco, chave, valor, ttl=None, jogo=None, versao=None):
+        pass
+
+    def remover(self, espaco, chave):
+        pass
+
+    def _invalidar(self, jogo, versao):
+        pass
+
+    def limpar(self, espaco=None):
+        pass
+
+    def tamanho_bytes(self):
+        return 0
+
+
+def criar_cache(especificacao, max_bytes=MAX_BYTES_PADRAO):
+    tipo, sep, destino = especificacao.partition(":")
+    if especificacao == "desligado":
+        return CacheDesligado(max_bytes)
+    if sep and tipo == "sqlite":
+        return CacheSQLite(destino, max_bytes)
+    if sep and tipo == "arquivos":
+        return CacheArquivos(destino, max_bytes)
+    return CacheArquivos(especificacao, max_bytes)
+
+
+cache_padrao = criar_cache(ESPECIFICACAO_PADRAO)
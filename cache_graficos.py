@@ -0,0 +1,147 @@
+import io
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from instrumentacao import registrar_cache
+
+# Gráficos da Exploração de Dados guardados por (jogo, versão dos dados, tipo):
+# imagens já renderizadas (PNG/SVG) ou os arrays que alimentam os gráficos
+# nativos do Streamlit. Um rerun com a mesma base não refaz figura nem KDE.
+# Há uma camada em memória (LRU) na frente do disco, que é compartilhado entre
+# processos; só as últimas versões de cada jogo são mantidas em disco.
+DIRETORIO_GRAFICOS = os.environ.get("LOTERICAS_CACHE_GRAFICOS", os.path.join(".cache", "graficos"))
+VERSOES_MANTIDAS = 5
+MAX_MEMORIA = 64
+
+_memoria = OrderedDict()
+_trava = threading.Lock()
+
+
+def _caminho(jogo, versao, tipo, extensao, diretorio):
+    return os.path.join(diretorio, jogo, versao, f"{tipo}.{extensao}")
+
+
+def _da_memoria(chave):
+    with _trava:
+        if chave in _memoria:
+            _memoria.move_to_end(chave)
+            return _memoria[chave]
+    return None
+
+
+def _para_memoria(chave, valor):
+    with _trava:
+        _memoria[chave] = valor
+        _memoria.move_to_end(chave)
+        while len(_memoria) > MAX_MEMORIA:
+            _memoria.popitem(last=False)
+
+
+def _gravar(caminho, escrever):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, "wb") as f:
+        escrever(f)
+    os.replace(temporario, caminho)
+    _podar(os.path.dirname(os.path.dirname(caminho)))
+
+
+def _mtime(caminho):
+    # Outra sessão pode ter podado a pasta entre o listdir e o stat.
+    try:
+        return os.path.getmtime(caminho)
+    except OSError:
+        return 0
+
+
+def _podar(pasta_jogo):
+    try:
+        nomes = os.listdir(pasta_jogo)
+    except OSError:
+        return
+    versoes = sorted((os.path.join(pasta_jogo, n) for n in nomes), key=_mtime)
+    for pasta in versoes[:-VERSOES_MANTIDAS]:
+        try:
+            for nome in os.listdir(pasta):
+                os.remove(os.path.join(pasta, nome))
+            os.rmdir(pasta)
+        except OSError:
+            continue
+
+
+def obter_imagem(jogo, versao, tipo, renderizar, formato="png", diretorio=DIRETORIO_GRAFICOS):
+    # `renderizar(arquivo, formato)` grava a figura em `arquivo`. Sem versão
+    # (ex.: sem cache colunar) a imagem é gerada e não é guardada.
+    def gerar():
+        buffer = io.BytesIO()
+        renderizar(buffer, formato)
+        return buffer.getvalue()
+
+    if versao is None:
+        return gerar()
+    chave = ("imagem", jogo, versao, tipo, formato)
+    dados = _da_memoria(chave)
+    if dados is not None:
+        registrar_cache(True)
+        return dados
+    caminho = _caminho(jogo, versao, tipo, formato, diretorio)
+    try:
+        with open(caminho, "rb") as f:
+            dados = f.read()
+        registrar_cache(True)
+    except OSError:
+        registrar_cache(False)
+        dados = gerar()
+        _gravar(caminho, lambda f: f.write(dados))
+    _para_memoria(chave, dados)
+    return dados
+
+
+def obter_arrays(jogo, versao, tipo, calcular, diretorio=DIRETORIO_GRAFICOS):
+    # `calcular()` devolve um dict nome -> array (numérico ou de texto).
+    if versao is None:
+        return calcular()
+    chave = ("arrays", jogo, versao, tipo)
+    arrays = _da_memoria(chave)
+    if arrays is not None:
+        registrar_cache(True)
+        return arrays
+    caminho = _caminho(jogo, versao, tipo, "npz", diretorio)
+    try:
+        with np.load(caminho, allow_pickle=False) as arquivo:
+            arrays = {nome: arquivo[nome] for nome in arquivo.files}
+        registrar_cache(True)
+    except (OSError, ValueError):
+        registrar_cache(False)
+        arrays = {nome: np.asarray(valor) for nome, valor in calcular().items()}
+        _gravar(caminho, lambda f: np.savez(f, **arrays))
+    _para_memoria(chave, arrays)
+    return arrays
+
+
+def histograma_kde(valores, bins=20, pontos=200):
+    # Histograma e KDE gaussiana (largura de banda pela regra de Scott),
+    # com a densidade escalada para contagens por bin. As somas são inteiras e
+    # se repetem muito, então a KDE é avaliada sobre os valores únicos com peso.
+    valores = np.asarray(valores, dtype=np.float64)
+    contagens, bordas = np.histogram(valores, bins=bins)
+    unicos, pesos = np.unique(valores, return_counts=True)
+    n = len(valores)
+    grade = np.linspace(valores.min(), valores.max(), pontos) if n else np.zeros(0)
+    desvio = valores.std(ddof=1) if n > 1 else 0.0
+    if desvio > 0:
+        banda = desvio * n ** (-1 / 5)
+        z = (grade[:, None] - unicos[None, :]) / banda
+        densidade = (np.exp(-0.5 * z * z) @ pesos) / (n * banda * np.sqrt(2 * np.pi))
+        kde = densidade * n * (bordas[1] - bordas[0])
+    else:
+        kde = np.zeros_like(grade)
+    return {"contagens": contagens, "bordas": bordas, "grade": grade, "kde": kde}
+
+
+def limpar_memoria():
+    with _trava:
+        _memoria.clear()
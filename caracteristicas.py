@@ -0,0 +1,84 @@
+from functools import cached_property
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Entradas do modelo multilabel: para prever o sorteio t usamos
+#   - os k sorteios anteriores como incidência one-hot (t-k .. t-1);
+#   - a frequência de cada número nos últimos `janela` sorteios;
+#   - há quantos sorteios cada número não sai (log1p do atraso).
+# A janela de defasagens é uma view (sliding_window_view) da matriz de
+# incidência, copiada uma única vez para a matriz de entradas. As amostras são
+# ordenadas pelo sorteio-alvo, então o treino até um certo concurso é só um
+# prefixo (view) de X e y: a validação reaproveita as mesmas matrizes em todas
+# as janelas.
+K_PADRAO = 5
+JANELA_FREQUENCIA_PADRAO = 20
+
+
+class CaracteristicasDefasadas:
+    def __init__(self, matriz, k=K_PADRAO, janela=JANELA_FREQUENCIA_PADRAO):
+        self.matriz = matriz
+        self.k = k
+        self.janela = janela
+
+    @property
+    def numeros(self):
+        return self.matriz.numeros
+
+    @property
+    def n_sorteios(self):
+        return self.matriz.n_sorteios
+
+    @property
+    def n_amostras(self):
+        # Sorteios-alvo com k anteriores disponíveis: k .. n_sorteios - 1.
+        return max(self.n_sorteios - self.k, 0)
+
+    @cached_property
+    def atrasos(self):
+        # atrasos[t, j] = sorteios desde a última vez que o número j saiu, visto
+        # antes do sorteio t (t = 0 .. n_sorteios). Nunca saiu: t + 1.
+        incidencia = self.matriz.incidencia
+        indices = np.arange(self.n_sorteios, dtype=np.int32)[:, None]
+        ultimo = np.maximum.accumulate(np.where(incidencia > 0, indices, -1), axis=0)
+        ultimo = np.vstack([np.full((1, incidencia.shape[1]), -1, dtype=ultimo.dtype), ultimo])
+        return np.arange(self.n_sorteios + 1, dtype=np.int32)[:, None] - ultimo
+
+    @cached_property
+    def X(self):
+        # Uma linha por sorteio-alvo t = k .. n_sorteios; a última é a entrada
+        # para o próximo sorteio, que ainda não aconteceu.
+        incidencia = self.matriz.incidencia
+        n_numeros = incidencia.shape[1]
+        linhas = self.n_sorteios - self.k + 1
+        bloco = n_numeros * self.k
+        X = np.empty((max(linhas, 0), bloco + 2 * n_numeros), dtype=np.float32)
+        if linhas <= 0:
+            return X
+
+        # (linhas, números, k) sem cópia; dividir o último eixo de X também é view.
+        janelas = sliding_window_view(incidencia, self.k, axis=0)
+        np.copyto(X[:, :bloco].reshape(linhas, n_numeros, self.k), janelas)
+
+        alvos = np.arange(self.k, self.n_sorteios + 1)
+        acumulada = np.vstack([np.zeros((1, n_numeros), dtype=np.int32), self.matriz.frequencia_acumulada])
+        recente = acumulada[alvos] - acumulada[np.maximum(alvos - self.janela, 0)]
+        np.divide(recente, self.janela, out=X[:, bloco:bloco + n_numeros], casting="unsafe")
+        np.log1p(self.atrasos[alvos], out=X[:, bloco + n_numeros:], casting="unsafe")
+        return X
+
+    @cached_property
+    def y(self):
+        return (self.matriz.incidencia[self.k:] > 0).astype(np.uint8)
+
+    def amostras(self, inicio=None, fim=None):
+        # (X, y) dos sorteios-alvo no intervalo [inicio, fim), como views.
+        inicio = self.k if inicio is None else max(inicio, self.k)
+        fim = self.n_sorteios if fim is None else min(fim, self.n_sorteios)
+        fim = max(fim, inicio)
+        return self.X[inicio - self.k:fim - self.k], self.y[inicio - self.k:fim - self.k]
+
+    def entrada(self, alvo):
+        # Entrada (1 × atributos) para prever o sorteio `alvo` (até n_sorteios).
+        return self.X[alvo - self.k:alvo - self.k + 1]
@@ -0,0 +1,37 @@
+import logging
+import sys
+
+# Permite usar `utils` fora do Streamlit (ex.: batch.py). Se o app já importou o
+# streamlit, usamos o módulo real; caso contrário, os decoradores de cache viram
+# no-ops e as mensagens vão para o logging. Funções de interface (st.write,
+# st.bar_chart...) não existem no modo headless.
+logger = logging.getLogger("lotericas")
+
+
+def _decorador_neutro(funcao=None, **_opcoes):
+    if funcao is None:
+        return lambda f: f
+    return funcao
+
+
+class _StreamlitHeadless:
+    cache_data = staticmethod(_decorador_neutro)
+    cache_resource = staticmethod(_decorador_neutro)
+
+    @staticmethod
+    def error(mensagem, *args, **kwargs):
+        logger.error(mensagem)
+
+    @staticmethod
+    def warning(mensagem, *args, **kwargs):
+        logger.warning(mensagem)
+
+    @staticmethod
+    def info(mensagem, *args, **kwargs):
+        logger.info(mensagem)
+
+    def __getattr__(self, nome):
+        raise AttributeError(f"st.{nome} não está disponível fora do Streamlit.")
+
+
+st = sys.modules["streamlit"] if "streamlit" in sys.modules else _StreamlitHeadless()
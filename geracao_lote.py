@@ -0,0 +1,83 @@
+import numpy as np
+
+from regras import regras_do_jogo
+
+# Geração em lote de jogos aleatórios a partir de `configs_jogos`. Cada lote é
+# um dicionário de arrays paralelos (uma linha por jogo); `gerar_lotes` produz
+# blocos de tamanho fixo para que milhões de jogos caibam em memória constante.
+# Com a mesma semente e o mesmo tamanho de bloco a saída é reprodutível.
+TAMANHO_BLOCO_PADRAO = 65536
+
+
+def _amostrar_sem_reposicao(rng, n, min_num, max_num, k):
+    tamanho = max_num - min_num + 1
+    if k > tamanho:
+        raise ValueError(f"Não é possível sortear {k} números distintos entre {min_num} e {max_num}.")
+    dtype = np.int8 if max_num <= np.iinfo(np.int8).max else np.int16
+    if k == tamanho:
+        return np.broadcast_to(np.arange(min_num, max_num + 1, dtype=dtype), (n, k)).copy()
+    # As k menores chaves aleatórias de cada linha formam uma amostra uniforme sem reposição.
+    chaves = rng.random((n, tamanho), dtype=np.float32)
+    escolhidos = np.argpartition(chaves, k - 1, axis=1)[:, :k]
+    escolhidos.sort(axis=1)
+    return (escolhidos + min_num).astype(dtype)
+
+
+def gerar_lote(config, n, rng=None, semente=None):
+    if rng is None:
+        rng = np.random.default_rng(semente)
+    regras = regras_do_jogo(config)
+    lote = {}
+
+    if regras.posicional:
+        lote["colunas"] = rng.integers(
+            regras.min_num, regras.max_num + 1, size=(n, regras.n_colunas), dtype=np.int8,
+        )
+        lote["numeros"] = lote["colunas"]
+    else:
+        lote["numeros"] = _amostrar_sem_reposicao(rng, n, regras.min_num, regras.max_num, regras.num_bolas)
+
+    if regras.trevos is not None:
+        lote["trevos"] = _amostrar_sem_reposicao(
+            rng, n, int(regras.trevos[0]), int(regras.trevos[-1]), regras.quantidade_trevos,
+        )
+
+    if regras.meses is not None:
+        lote["mes"] = rng.integers(1, 13, size=n, dtype=np.int8)
+
+    if regras.times is not None:
+        lote["time"] = regras.times[rng.integers(0, len(regras.times), size=n)]
+
+    return lote
+
+
+def gerar_lotes(config, n_total, tamanho_bloco=TAMANHO_BLOCO_PADRAO, semente=None):
+    rng = np.random.default_rng(semente)
+    restantes = n_total
+    while restantes > 0:
+        n = min(tamanho_bloco, restantes)
+        yield gerar_lote(config, n, rng=rng)
+        restantes -= n
+
+
+def escrever_lotes_csv(arquivo, lotes, separador=";"):
+    # Grava os blocos à medida que são gerados; `arquivo` é um objeto texto aberto.
+    cabecalho_escrito = False
+    for lote in lotes:
+        campos = [c for c in ("numeros", "trevos", "mes", "time") if c in lote]
+        if not cabecalho_escrito:
+            cabecalho = []
+            for campo in campos:
+                valores = lote[campo]
+                if valores.ndim == 2:
+                    cabecalho += [f"{campo}{j+1}" for j in range(valores.shape[1])]
+                else:
+                    cabecalho.append(campo)
+            arquivo.write(separador.join(cabecalho) + "\n")
+            cabecalho_escrito = True
+        colunas = []
+        for campo in campos:
+            valores = lote[campo]
+            colunas.append(valores.astype(str) if valores.ndim == 2 else valores.astype(str)[:, None])
+        linhas = np.hstack(colunas)
+        arquivo.writelines(separador.join(linha) + "\n" for linha in linhas)
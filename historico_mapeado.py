@@ -0,0 +1,256 @@
+import os
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from analise_combinatoria import AnaliseCombinatoria
+from indice_combinacoes import IndiceCombinacoes
+from matriz_sorteios import VALOR_AUSENTE, MatrizSorteios, estatisticas_de_momentos
+from pontuacao_bilhetes import PontuadorBilhetes
+from regras import regras_do_jogo
+
+# Históricos longos ou sintéticos (milhões de sorteios) fora do DataFrame: as
+# bolas ficam num .npy int8 (VALOR_AUSENTE nos ausentes) lido por memória
+# mapeada em blocos de TAMANHO_BLOCO_PADRAO sorteios. Cada bloco vira uma
+# MatrizSorteios na faixa do histórico inteiro e as estatísticas são somadas
+# bloco a bloco, então a memória não cresce com o número de sorteios e os
+# resultados são os mesmos do caminho em memória (matriz_sorteios,
+# analise_combinatoria e indice_combinacoes de utils.dados).
+TAMANHO_BLOCO_PADRAO = 1 << 16
+
+
+def blocos_de_dataframe(bolas_df, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    # Mesma conversão de MatrizSorteios.de_dataframe, um bloco por vez: as
+    # colunas Int64 passam por float64, sem arrays de objetos.
+    for inicio in range(0, len(bolas_df), tamanho_bloco):
+        valores = bolas_df.iloc[inicio:inicio + tamanho_bloco].astype("float64").to_numpy()
+        yield np.where(np.isnan(valores), VALOR_AUSENTE, valores).astype(np.int16)
+
+
+def gravar_historico(caminho, blocos, n_sorteios, n_colunas):
+    # Grava os blocos (linhas × n_colunas) à medida que chegam, por exemplo de
+    # geracao_lote.gerar_lotes ou de blocos_de_dataframe.
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    destino = np.lib.format.open_memmap(temporario, mode="w+", dtype=np.int8, shape=(n_sorteios, n_colunas))
+    concluido = False
+    try:
+        posicao = 0
+        for bloco in blocos:
+            bloco = np.atleast_2d(np.asarray(bloco))
+            if posicao + len(bloco) > n_sorteios:
+                raise ValueError(f"Mais de {n_sorteios} sorteios nos blocos.")
+            if bloco.size and (bloco.min() < VALOR_AUSENTE or bloco.max() > np.iinfo(np.int8).max):
+                raise ValueError("Números fora da faixa de int8.")
+            destino[posicao:posicao + len(bloco)] = bloco
+            posicao += len(bloco)
+        if posicao != n_sorteios:
+            raise ValueError(f"Esperados {n_sorteios} sorteios, recebidos {posicao}.")
+        destino.flush()
+        concluido = True
+    finally:
+        # O mapa é fechado antes de mover ou apagar o arquivo.
+        del destino
+        if not concluido:
+            os.remove(temporario)
+    os.replace(temporario, caminho)
+
+
+def gravar_dataframe(caminho, bolas_df, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    gravar_historico(caminho, blocos_de_dataframe(bolas_df, tamanho_bloco), len(bolas_df), bolas_df.shape[1])
+
+
+class HistoricoMapeado:
+    def __init__(self, caminho, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+        self.caminho = caminho
+        self.bolas = np.load(caminho, mmap_mode="r")
+        self.tamanho_bloco = tamanho_bloco
+
+    @property
+    def n_sorteios(self):
+        return self.bolas.shape[0]
+
+    def blocos(self):
+        # (início, bloco) com o bloco copiado do mapa para a memória.
+        for inicio in range(0, self.n_sorteios, self.tamanho_bloco):
+            yield inicio, np.array(self.bolas[inicio:inicio + self.tamanho_bloco])
+
+    @cached_property
+    def _faixa(self):
+        # Faixa dos números presentes, como a de MatrizSorteios sem faixa informada.
+        return _faixa_dos_blocos(bloco for _, bloco in self.blocos())
+
+    @property
+    def min_num(self):
+        return self._faixa[0]
+
+    @property
+    def max_num(self):
+        return self._faixa[1]
+
+    @property
+    def numeros(self):
+        return np.arange(self.min_num, self.max_num + 1)
+
+    def _matrizes(self):
+        for inicio, bloco in self.blocos():
+            yield inicio, MatrizSorteios(bloco, self.min_num, self.max_num)
+
+    @cached_property
+    def frequencia(self):
+        frequencia = np.zeros(len(self.numeros), dtype=np.int64)
+        for _, matriz in self._matrizes():
+            frequencia += matriz.frequencia
+        return frequencia
+
+    @cached_property
+    def _momentos_soma(self):
+        soma = soma_quadrados = 0
+        for _, matriz in self._matrizes():
+            somas = matriz.somas
+            soma += int(somas.sum())
+            soma_quadrados += int((somas * somas).sum())
+        return soma, soma_quadrados
+
+    def estatisticas_soma(self):
+        return estatisticas_de_momentos(self.n_sorteios, *self._momentos_soma)
+
+    def serie_frequencia(self):
+        observados = self.frequencia > 0
+        return pd.Series(self.frequencia[observados], index=pd.Index(self.numeros[observados]), name="count")
+
+    def total_numeros(self):
+        return self.bolas.size
+
+    def numeros_unicos(self):
+        return int(np.count_nonzero(self.frequencia))
+
+    def ultimo_sorteio(self):
+        ultimo = np.array(self.bolas[-1])
+        return [int(n) for n in ultimo[ultimo != VALOR_AUSENTE]]
+
+    def contem_lote(self, jogos, posicional=False):
+        # Quais jogos já saíram, sem montar o índice do histórico inteiro: o
+        # índice é das consultas, e cada bloco só guarda as linhas que batem.
+        jogos = np.atleast_2d(np.asarray(jogos, dtype=np.int64))
+        resultado = np.zeros(len(jogos), dtype=bool)
+        na_faixa = ((jogos >= self.min_num) & (jogos <= self.max_num)).all(axis=1)
+        if not na_faixa.any():
+            return resultado
+        consultas = IndiceCombinacoes(jogos[na_faixa], self.min_num, self.max_num, posicional=posicional)
+        encontrados = [bloco[consultas.contem_lote(bloco)] for _, bloco in self.blocos()]
+        sorteados = IndiceCombinacoes(
+            np.vstack(encontrados) if encontrados else np.empty((0, jogos.shape[1]), dtype=np.int64),
+            self.min_num, self.max_num, posicional=posicional,
+        )
+        resultado[na_faixa] = sorteados.contem_lote(jogos[na_faixa])
+        return resultado
+
+    def contem(self, jogo, posicional=False):
+        return bool(self.contem_lote([list(map(int, jogo))], posicional)[0])
+
+    def analise(self, config):
+        return AnaliseEmBlocos(self, config)
+
+
+def _faixa_dos_blocos(blocos, min_num=None, max_num=None):
+    for bloco in blocos:
+        presentes = bloco[bloco != VALOR_AUSENTE]
+        if presentes.size:
+            min_num = int(presentes.min()) if min_num is None else min(min_num, int(presentes.min()))
+            max_num = int(presentes.max()) if max_num is None else max(max_num, int(presentes.max()))
+    return min_num or 0, max_num or 0
+
+
+class AnaliseEmBlocos(AnaliseCombinatoria):
+    # AnaliseCombinatoria sobre o histórico mapeado, codificado pelas regras
+    # do jogo como em utils.dados.analise_combinatoria. Coocorrências, atrasos
+    # e acertos são acumulados bloco a bloco; os métodos de consulta
+    # (pares_mais_frequentes etc.) são os mesmos.
+    def __init__(self, historico, config):
+        self.historico = historico
+        self.regras = regras_do_jogo(config)
+
+    def _codigos(self):
+        for inicio, bloco in self.historico.blocos():
+            yield inicio, self.regras.codificar(bloco)
+
+    @cached_property
+    def _faixa(self):
+        return _faixa_dos_blocos((codigos for _, codigos in self._codigos()), *self.regras.faixa_codigos)
+
+    @property
+    def numeros(self):
+        return np.arange(self._faixa[0], self._faixa[1] + 1)
+
+    def _presencas(self):
+        for inicio, codigos in self._codigos():
+            yield inicio, MatrizSorteios(codigos, *self._faixa).incidencia > 0
+
+    @cached_property
+    def pares(self):
+        n = len(self.numeros)
+        pares = np.zeros((n, n), dtype=np.int64)
+        for _, presente in self._presencas():
+            A = presente.astype(np.float32)
+            pares += (A.T @ A).astype(np.int64)
+        return pares
+
+    @cached_property
+    def trios(self):
+        n = len(self.numeros)
+        trios = np.zeros((n, n, n), dtype=np.int64)
+        for _, presente in self._presencas():
+            A = presente.astype(np.float32)
+            for i in range(n):
+                linhas = A[A[:, i] > 0]
+                if len(linhas):
+                    trios[i] += (linhas.T @ linhas).astype(np.int64)
+        return trios
+
+    @cached_property
+    def _resumo_atrasos(self):
+        # Carrega entre os blocos o último sorteio em que cada número saiu.
+        n = len(self.numeros)
+        ultimo = np.full(n, -1, dtype=np.int64)
+        atual = np.zeros(n, dtype=np.int64)
+        maximo = np.zeros(n, dtype=np.int64)
+        for inicio, presente in self._presencas():
+            indices = np.arange(inicio, inicio + len(presente))[:, None]
+            ultimos = np.maximum(np.maximum.accumulate(np.where(presente, indices, -1), axis=0), ultimo)
+            atrasos = indices - ultimos
+            atual, ultimo = atrasos[-1], ultimos[-1]
+            np.maximum(maximo, atrasos.max(axis=0), out=maximo)
+        return atual, maximo
+
+    @property
+    def atraso_atual(self):
+        return self._resumo_atrasos[0]
+
+    @property
+    def atraso_maximo(self):
+        return self._resumo_atrasos[1]
+
+    def _pontuadores(self):
+        for inicio, presente in self._presencas():
+            yield inicio, PontuadorBilhetes(presente, self._faixa[0])
+
+    def acertos(self, bilhete):
+        bilhete = [sorted(set(int(n) for n in bilhete))]
+        acertos = [pontuador.matriz_acertos(bilhete)[0] for _, pontuador in self._pontuadores()]
+        return np.concatenate(acertos).astype(np.int64) if acertos else np.zeros(0, dtype=np.int64)
+
+    def distribuicao_acertos(self, bilhete):
+        return self._histograma([sorted(set(int(n) for n in bilhete))])[0]
+
+    def histograma(self, bilhetes):
+        # Como utils.dados.pontuar_bilhetes(..., histograma=True): bilhetes com
+        # os números do jogo, codificados pelas regras (posicionais no SuperSete).
+        return self._histograma(self.regras.codificar(bilhetes))
+
+    def _histograma(self, codigos):
+        codigos = np.atleast_2d(np.asarray(codigos))
+        histograma = np.zeros((len(codigos), codigos.shape[1] + 1), dtype=np.int64)
+        for _, pontuador in self._pontuadores():
+            histograma += pontuador.histograma(codigos)
+        return histograma
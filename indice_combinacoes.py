@@ -0,0 +1,92 @@
+import numpy as np
+
+from matriz_sorteios import VALOR_AUSENTE
+
+# Índice das combinações já sorteadas. Cada jogo vira uma chave compacta:
+# - jogos de conjunto (Mega, Quina...): bitmask dos números em palavras de 64 bits,
+#   de modo que a ordem das bolas não importa;
+# - jogos posicionais (SuperSete): o número em base (max-min+1) formado pelas colunas.
+# As chaves do histórico ficam ordenadas para consultas em lote com searchsorted e
+# num set de bytes para consultas unitárias em O(1). Os sorteios completos ficam
+# guardados para refazer o índice quando sorteios anexados saem da faixa.
+
+
+class IndiceCombinacoes:
+    def __init__(self, bolas, min_num, max_num, posicional=False):
+        bolas = np.asarray(bolas)
+        self.min_num = int(min_num)
+        self.max_num = int(max_num)
+        self.posicional = posicional
+        completos = bolas[(bolas >= self.min_num).all(axis=1)]
+        self.bolas = completos
+        self.n_palavras = 1 if posicional else (self.max_num - self.min_num) // 64 + 1
+        self._tipo_chave = np.dtype((np.void, 8 * self.n_palavras))
+        self._ordenadas = np.unique(self._chaves_void(completos))
+        self._conjunto = frozenset(chave.tobytes() for chave in self._ordenadas)
+
+    @classmethod
+    def de_matriz(cls, matriz, posicional=False):
+        return cls(matriz.bolas, matriz.min_num, matriz.max_num, posicional=posicional)
+
+    def chaves(self, jogos):
+        jogos = np.atleast_2d(np.asarray(jogos, dtype=np.int64)) - self.min_num
+        n = jogos.shape[0]
+        if self.posicional:
+            base = self.max_num - self.min_num + 1
+            pesos = base ** np.arange(jogos.shape[1] - 1, -1, -1, dtype=np.uint64)
+            return (jogos.astype(np.uint64) * pesos).sum(axis=1, dtype=np.uint64).reshape(n, 1)
+        palavras = np.zeros((n, self.n_palavras), dtype=np.uint64)
+        linhas = np.arange(n)
+        for coluna in jogos.T:
+            palavras[linhas, coluna // 64] |= np.left_shift(np.uint64(1), (coluna % 64).astype(np.uint64))
+        return palavras
+
+    def anexar(self, bolas_novas):
+        bolas_novas = np.atleast_2d(np.asarray(bolas_novas))
+        completos = bolas_novas[(bolas_novas != VALOR_AUSENTE).all(axis=1)]
+        if completos.size and not self._na_faixa(completos).all():
+            # Como em MatrizSorteios.anexar: com a faixa maior as chaves mudam
+            # de largura (ou de base), então o índice é refeito.
+            return IndiceCombinacoes(
+                np.vstack([self.bolas, completos]), min(self.min_num, int(completos.min())),
+                max(self.max_num, int(completos.max())), posicional=self.posicional,
+            )
+        resultado = IndiceCombinacoes.__new__(IndiceCombinacoes)
+        resultado.__dict__.update(self.__dict__)
+        resultado.bolas = np.vstack([self.bolas, completos])
+        novas = self._chaves_void(completos)
+        resultado._ordenadas = np.union1d(self._ordenadas, novas)
+        resultado._conjunto = self._conjunto | {chave.tobytes() for chave in novas}
+        return resultado
+
+    def _chaves_void(self, jogos):
+        if len(jogos) == 0:
+            return np.empty(0, dtype=self._tipo_chave)
+        return np.ascontiguousarray(self.chaves(jogos)).view(self._tipo_chave).ravel()
+
+    def __len__(self):
+        return len(self._ordenadas)
+
+    def __contains__(self, jogo):
+        return self.contem(jogo)
+
+    def _na_faixa(self, jogos):
+        return ((jogos >= self.min_num) & (jogos <= self.max_num)).all(axis=1)
+
+    def contem(self, jogo):
+        jogo = np.asarray([list(map(int, jogo))], dtype=np.int64)
+        if not self._na_faixa(jogo)[0]:
+            return False
+        return self._chaves_void(jogo)[0].tobytes() in self._conjunto
+
+    def contem_lote(self, jogos):
+        jogos = np.atleast_2d(np.asarray(jogos, dtype=np.int64))
+        resultado = np.zeros(len(jogos), dtype=bool)
+        na_faixa = self._na_faixa(jogos)
+        if len(self._ordenadas) == 0 or not na_faixa.any():
+            return resultado
+        consultas = self._chaves_void(jogos[na_faixa])
+        posicoes = np.searchsorted(self._ordenadas, consultas)
+        posicoes = np.minimum(posicoes, len(self._ordenadas) - 1)
+        resultado[na_faixa] = self._ordenadas[posicoes] == consultas
+        return resultado
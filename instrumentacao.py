@@ -0,0 +1,251 @@
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Contadores por função: chamadas, tempo de parede, acertos/falhas de cache e
+# pico de memória. As funções públicas de `utils` são decoradas com `@medir`;
+# trechos internos (ex.: `MLPClassifier.fit`) usam `with medindo(nome)`.
+# O pico de memória usa tracemalloc, que deixa o Python bem mais lento; só é
+# ligado com LOTERICAS_PERFIL_MEMORIA=1. Como o tracemalloc é global ao
+# processo, o pico de chamadas concorrentes (ex.: treinos em segundo plano) é
+# aproximado.
+MEDIR_MEMORIA = os.environ.get("LOTERICAS_PERFIL_MEMORIA") == "1"
+logger = logging.getLogger("lotericas")
+
+_estatisticas = {}
+_trava = threading.Lock()
+_local = threading.local()
+
+
+class Medicao:
+    def __init__(self, nome):
+        self.nome = nome
+        self.cache_acertos = 0
+        self.cache_falhas = 0
+        self.memoria_base = 0
+        self.pico_filhos = 0
+
+
+class Coleta:
+    # Acumula só as chamadas feitas na thread que a criou (ex.: uma execução
+    # do script do Streamlit), para o detalhamento por rerun.
+    def __init__(self):
+        self.estatisticas = {}
+        self.inicio = time.perf_counter()
+
+    def duracao(self):
+        return time.perf_counter() - self.inicio
+
+    def linhas(self):
+        return _linhas(self.estatisticas)
+
+
+def _pilha():
+    if not hasattr(_local, "pilha"):
+        _local.pilha = []
+    return _local.pilha
+
+
+def _acumular(destino, nome, duracao, medicao, pico):
+    item = destino.get(nome)
+    if item is None:
+        item = destino[nome] = {
+            "chamadas": 0, "tempo_total_s": 0.0, "tempo_max_s": 0.0,
+            "cache_acertos": 0, "cache_falhas": 0, "pico_memoria_bytes": 0,
+        }
+    item["chamadas"] += 1
+    item["tempo_total_s"] += duracao
+    item["tempo_max_s"] = max(item["tempo_max_s"], duracao)
+    item["cache_acertos"] += medicao.cache_acertos
+    item["cache_falhas"] += medicao.cache_falhas
+    item["pico_memoria_bytes"] = max(item["pico_memoria_bytes"], pico)
+
+
+def _iniciar_memoria(medicao, pilha):
+    import tracemalloc
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    atual, pico = tracemalloc.get_traced_memory()
+    # reset_peak apaga o pico da medição externa; ele é guardado nela antes.
+    if pilha:
+        pilha[-1].pico_filhos = max(pilha[-1].pico_filhos, pico)
+    tracemalloc.reset_peak()
+    medicao.memoria_base = atual
+
+
+def _encerrar_memoria(medicao, pilha):
+    import tracemalloc
+
+    _, pico = tracemalloc.get_traced_memory()
+    pico = max(pico, medicao.pico_filhos)
+    if pilha:
+        pilha[-1].pico_filhos = max(pilha[-1].pico_filhos, pico)
+    return max(pico - medicao.memoria_base, 0)
+
+
+@contextmanager
+def medindo(nome):
+    pilha = _pilha()
+    medicao = Medicao(nome)
+    if MEDIR_MEMORIA:
+        _iniciar_memoria(medicao, pilha)
+    pilha.append(medicao)
+    inicio = time.perf_counter()
+    try:
+        yield medicao
+    finally:
+        duracao = time.perf_counter() - inicio
+        pilha.pop()
+        pico = _encerrar_memoria(medicao, pilha) if MEDIR_MEMORIA else 0
+        with _trava:
+            _acumular(_estatisticas, nome, duracao, medicao, pico)
+        coleta = getattr(_local, "coleta", None)
+        if coleta is not None:
+            _acumular(coleta.estatisticas, nome, duracao, medicao, pico)
+
+
+def medir(funcao=None, nome=None, cache=False):
+    # Uso: @medir ou @medir(nome="...", cache=True). Com cache=True (funções
+    # de st.cache_data/st.cache_resource), o corpo cacheado registra a falha
+    # com registrar_cache(False) e uma chamada sem falha conta como acerto.
+    if funcao is None:
+        return lambda f: medir(f, nome=nome, cache=cache)
+    nome = nome or f"{funcao.__module__}.{funcao.__qualname__}"
+
+    @functools.wraps(funcao)
+    def medida(*args, **kwargs):
+        with medindo(nome) as medicao:
+            resultado = funcao(*args, **kwargs)
+            if cache and not medicao.cache_falhas:
+                medicao.cache_acertos += 1
+            return resultado
+
+    return medida
+
+
+def medicao_atual():
+    pilha = _pilha()
+    return pilha[-1] if pilha else None
+
+
+def registrar_cache(acerto):
+    # Atribui o acesso ao cache à medição mais interna em andamento.
+    medicao = medicao_atual()
+    if medicao is None:
+        return
+    if acerto:
+        medicao.cache_acertos += 1
+    else:
+        medicao.cache_falhas += 1
+
+
+def iniciar_coleta():
+    # Substitui a coleta anterior da thread: um rerun interrompido por
+    # st.stop() não chega a encerrar a sua.
+    _local.coleta = Coleta()
+    return _local.coleta
+
+
+def encerrar_coleta():
+    coleta = getattr(_local, "coleta", None)
+    _local.coleta = None
+    return coleta
+
+
+def instantaneo():
+    with _trava:
+        return {nome: dict(item) for nome, item in _estatisticas.items()}
+
+
+def zerar():
+    with _trava:
+        _estatisticas.clear()
+
+
+def _linhas(estatisticas):
+    linhas = [{"funcao": nome, **item} for nome, item in estatisticas.items()]
+    return sorted(linhas, key=lambda linha: -linha["tempo_total_s"])
+
+
+def linhas():
+    return _linhas(instantaneo())
+
+
+METRICAS_PROMETHEUS = (
+    ("chamadas", "lotericas_funcao_chamadas_total", "counter", "Chamadas da função."),
+    ("tempo_total_s", "lotericas_funcao_segundos_total", "counter", "Tempo de parede acumulado."),
+    ("tempo_max_s", "lotericas_funcao_segundos_max", "gauge", "Maior tempo de parede de uma chamada."),
+    ("cache_acertos", "lotericas_funcao_cache_acertos_total", "counter", "Acertos de cache."),
+    ("cache_falhas", "lotericas_funcao_cache_falhas_total", "counter", "Falhas de cache."),
+    ("pico_memoria_bytes", "lotericas_funcao_pico_memoria_bytes", "gauge", "Pico de memória alocada numa chamada."),
+)
+
+
+def exportar_prometheus():
+    estatisticas = instantaneo()
+    saida = []
+    for campo, metrica, tipo, ajuda in METRICAS_PROMETHEUS:
+        saida.append(f"# HELP {metrica} {ajuda}")
+        saida.append(f"# TYPE {metrica} {tipo}")
+        for nome in sorted(estatisticas):
+            rotulo = nome.replace("\\", "\\\\").replace('"', '\\"')
+            saida.append(f'{metrica}{{funcao="{rotulo}"}} {estatisticas[nome][campo]}')
+    return "\n".join(saida) + "\n"
+
+
+def exportar_jsonl(caminho, contexto=None):
+    # Acrescenta uma linha por função, com data e um contexto opcional (ex.: o
+    # jogo processado), para comparar execuções ao longo do tempo.
+    registrado_em = time.strftime("%Y-%m-%dT%H:%M:%S")
+    with open(caminho, "a", encoding="utf-8") as f:
+        for linha in linhas():
+            f.write(json.dumps({"registrado_em": registrado_em, **(contexto or {}), **linha}) + "\n")
+
+
+_servidor = None
+_servidor_falhou = False
+_trava_servidor = threading.Lock()
+
+
+def servir_prometheus(porta, endereco="127.0.0.1"):
+    # Servidor HTTP mínimo em thread daemon: GET /metrics devolve o texto do
+    # Prometheus. Chamadas repetidas (ex.: a cada rerun) reaproveitam o servidor.
+    # Se a porta já está em uso (ex.: segunda réplica no mesmo host), o erro é
+    # registrado uma vez e o processo segue sem /metrics.
+    global _servidor, _servidor_falhou
+    with _trava_servidor:
+        if _servidor is None and not _servidor_falhou:
+            try:
+                _servidor = _criar_servidor(porta, endereco)
+            except OSError as e:
+                _servidor_falhou = True
+                logger.warning("Métricas do Prometheus desligadas: porta %s:%s indisponível (%s).", endereco, porta, e)
+    return _servidor
+
+
+def _criar_servidor(porta, endereco):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Metricas(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            corpo = exportar_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, formato, *args):
+            pass
+
+    servidor = ThreadingHTTPServer((endereco, porta), Metricas)
+    threading.Thread(target=servidor.serve_forever, daemon=True, name="lotericas-metricas").start()
+    return servidor
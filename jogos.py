@@ -0,0 +1,48 @@
+TIMES_TIMEMANIA = [
+    "ABC", "ALTOS", "AMAZONAS", "AMÉRICA", "APARECIDENSE", "ATHLETIC CLUB",
+    "ATHLETICO", "ATLÉTICO", "ATLÉTICO MINEIRO", "AVAÍ", "BAHIA", "BAHIA DE FEIRA",
+    "BOTAFOGO", "BRAGANTINO", "BRASIL", "BRASILIENSE", "BRUSQUE", "CAMPINENSE", "CASCAVEL",
+    "CAXIAS", "CEARÁ", "CEILÂNDIA", "CHAPECOENSE", "CONFIANÇA", "CORINTHIANS", "CORITIBA",
+    "CRB", "CRICIÚMA", "CRUZEIRO", "CSA", "CUIABÁ", "FERROVIÁRIA", "FERROVIÁRIO",
+    "FIGUEIRENSE", "FLAMENGO", "FLORESTA", "FLUMINENSE", "FORTALEZA", "GOIÁS", "GRÊMIO",
+    "GUARANI", "INTERNACIONAL", "ITUANO", "JACUIPENSE", "JUAZEIRENSE", "JUVENTUDE",
+    "LONDRINA", "MANAUS", "MIRASSOL", "NÁUTICO", "NOVA IGUAÇU", "NOVORIZONTINO",
+    "OESTE", "OPERÁRIO", "PALMEIRAS", "PARANÁ", "PAYSANDU", "PONTE PRETA", "PORTUGUESA",
+    "POUSO ALEGRE", "REMO", "RETRÔ", "SAMPAIO CORRÊA", "SANTA CRUZ", "SANTOS", "SÃO BERNARDO",
+    "SÃO JOSÉ", "SÃO PAULO", "SÃO RAIMUNDO", "SPORT", "TOCANTINÓPOLIS", "TOMBENSE",
+    "VASCO", "VILA NOVA", "VITÓRIA", "VOLTA REDONDA", "YPIRANGA"
+]
+
+configs_jogos = {
+    "LotoFacil": {"min_num": 1, "max_num": 25, "num_bolas": 15},
+    "MegaSena": {"min_num": 1, "max_num": 60, "num_bolas": 6},
+    "Quina": {"min_num": 1, "max_num": 80, "num_bolas": 5},
+    "Milionaria": {
+        "min_num": 1,
+        "max_num": 50,
+        "num_bolas": 6,
+        "quantidade_trevos_selecionar": 2,
+        "faixa_trevos_disponiveis": (1, 6)
+    },
+    "DuplaSena": {"min_num": 1, "max_num": 50, "num_bolas": 6},
+    "Timemania": {
+        "min_num": 1,
+        "max_num": 80,
+        "num_bolas": 10,
+        "quantidade_times_selecionar": 1,
+        "lista_times_disponiveis": TIMES_TIMEMANIA
+    },
+    "DiaDeSorte": {
+        "min_num": 1,
+        "max_num": 31,
+        "num_bolas": 7,
+        "quantidade_meses_selecionar": 1
+    },
+    "SuperSete": {
+        "min_num": 0,
+        "max_num": 9,
+        "num_bolas": 7,
+        "quantidade_colunas": 7,
+        "faixa_numeros_por_coluna": (0, 9)
+    }
+}
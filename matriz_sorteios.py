@@ -0,0 +1,126 @@
+import math
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+# Representação densa do histórico de sorteios, montada uma vez por versão dos
+# dados e compartilhada por todas as abas. Cada estatística é uma leitura
+# direta ou uma única redução NumPy, em vez de refiltrar o DataFrame.
+VALOR_AUSENTE = -1
+
+
+def estatisticas_de_momentos(n, soma, soma_quadrados):
+    # Média e desvio padrão amostral a partir das somas inteiras exatas; o
+    # histórico em blocos (historico_mapeado.py) acumula as mesmas somas e
+    # chega ao mesmo resultado, bit a bit.
+    if n == 0:
+        return float("nan"), float("nan")
+    desvio = math.sqrt((n * soma_quadrados - soma * soma) / (n * (n - 1))) if n > 1 else float("nan")
+    return soma / n, desvio
+
+
+class MatrizSorteios:
+    def __init__(self, bolas, min_num=None, max_num=None):
+        bolas = np.asarray(bolas)
+        validos = bolas != VALOR_AUSENTE
+        presentes = bolas[validos]
+        # A faixa informada (ex.: da config do jogo) é ampliada se os dados saírem dela.
+        if presentes.size:
+            min_num = int(presentes.min()) if min_num is None else min(min_num, int(presentes.min()))
+            max_num = int(presentes.max()) if max_num is None else max(max_num, int(presentes.max()))
+        self.min_num = min_num or 0
+        self.max_num = max_num or 0
+        dtype = np.int8 if self.max_num <= np.iinfo(np.int8).max else np.int16
+        self.bolas = bolas.astype(dtype, copy=False)
+        self.validos = validos
+
+    @classmethod
+    def de_dataframe(cls, bolas_df, min_num=None, max_num=None):
+        valores = bolas_df.astype("float64").to_numpy()
+        ausentes = np.isnan(valores)
+        bolas = np.where(ausentes, VALOR_AUSENTE, valores).astype(np.int16)
+        return cls(bolas, min_num=min_num, max_num=max_num)
+
+    def anexar(self, bolas_novas):
+        # Nova matriz com os sorteios acrescentados. As estatísticas já
+        # calculadas são estendidas só com as linhas novas, sem refazer o histórico.
+        novos = MatrizSorteios(bolas_novas, self.min_num, self.max_num)
+        if (novos.min_num, novos.max_num) != (self.min_num, self.max_num):
+            return MatrizSorteios(np.vstack([self.bolas, novos.bolas]))
+        resultado = MatrizSorteios.__new__(MatrizSorteios)
+        resultado.min_num, resultado.max_num = self.min_num, self.max_num
+        resultado.bolas = np.vstack([self.bolas, novos.bolas.astype(self.bolas.dtype)])
+        resultado.validos = np.vstack([self.validos, novos.validos])
+        calculados = self.__dict__
+        if "incidencia" in calculados:
+            resultado.incidencia = np.vstack([self.incidencia, novos.incidencia])
+        if "frequencia" in calculados:
+            resultado.frequencia = self.frequencia + novos.frequencia
+        if "frequencia_acumulada" in calculados:
+            base = self.frequencia_acumulada[-1] if self.n_sorteios else 0
+            resultado.frequencia_acumulada = np.vstack([self.frequencia_acumulada, base + novos.frequencia_acumulada])
+        for nome in ("somas", "pares", "impares"):
+            if nome in calculados:
+                setattr(resultado, nome, np.concatenate([calculados[nome], getattr(novos, nome)]))
+        return resultado
+
+    @property
+    def n_sorteios(self):
+        return self.bolas.shape[0]
+
+    @property
+    def numeros(self):
+        return np.arange(self.min_num, self.max_num + 1)
+
+    @cached_property
+    def incidencia(self):
+        # (sorteios × números): quantas vezes cada número saiu em cada sorteio.
+        # Para jogos sem repetição é um one-hot; no SuperSete conta dígitos repetidos.
+        n = self.max_num - self.min_num + 1
+        incidencia = np.zeros((self.n_sorteios, n), dtype=np.uint8)
+        linhas, colunas = np.nonzero(self.validos)
+        np.add.at(incidencia, (linhas, self.bolas[linhas, colunas] - self.min_num), 1)
+        return incidencia
+
+    @cached_property
+    def frequencia(self):
+        return self.incidencia.sum(axis=0, dtype=np.int64)
+
+    @cached_property
+    def frequencia_acumulada(self):
+        return np.cumsum(self.incidencia, axis=0, dtype=np.int32)
+
+    @cached_property
+    def somas(self):
+        return np.where(self.validos, self.bolas, 0).sum(axis=1, dtype=np.int64)
+
+    @cached_property
+    def pares(self):
+        return (self.validos & (self.bolas % 2 == 0)).sum(axis=1)
+
+    @cached_property
+    def impares(self):
+        return self.validos.sum(axis=1) - self.pares
+
+    def serie_frequencia(self):
+        # Mesmo formato de `value_counts().sort_index()`: só números que já saíram.
+        observados = self.frequencia > 0
+        return pd.Series(
+            self.frequencia[observados],
+            index=pd.Index(self.numeros[observados]),
+            name="count",
+        )
+
+    def estatisticas_soma(self):
+        somas = self.somas
+        return estatisticas_de_momentos(somas.size, int(somas.sum()), int((somas * somas).sum()))
+
+    def total_numeros(self):
+        return self.bolas.size
+
+    def numeros_unicos(self):
+        return int(np.count_nonzero(self.frequencia))
+
+    def ultimo_sorteio(self):
+        return [int(n) for n in self.bolas[-1][self.validos[-1]]]
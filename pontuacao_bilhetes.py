@@ -0,0 +1,82 @@
+import numpy as np
+
+from matriz_sorteios import VALOR_AUSENTE
+
+# Pontuação em lote: acertos de N bilhetes (N × k) contra todos os D sorteios
+# do histórico. Bilhetes e sorteios viram incidência one-hot (linhas × números)
+# e os acertos são o produto B · Aᵀ, feito pelo BLAS em float32 (exato para
+# contagens pequenas). Os bilhetes são processados em blocos para que cada
+# produto intermediário tenha no máximo MAX_ELEMENTOS_BLOCO elementos.
+MAX_ELEMENTOS_BLOCO = 1 << 24
+
+
+def incidencia_jogos(jogos, min_num, max_num):
+    # Números repetidos num jogo contam uma vez; VALOR_AUSENTE é ignorado.
+    jogos = np.atleast_2d(np.asarray(jogos, dtype=np.int64))
+    validos = jogos != VALOR_AUSENTE
+    colunas = jogos - min_num
+    n_numeros = max_num - min_num + 1
+    if ((colunas < 0) | (colunas >= n_numeros))[validos].any():
+        raise ValueError(f"Jogos com números fora da faixa {min_num}-{max_num}.")
+    incidencia = np.zeros((len(jogos), n_numeros), dtype=np.float32)
+    linhas = np.broadcast_to(np.arange(len(jogos))[:, None], jogos.shape)
+    incidencia[linhas[validos], colunas[validos]] = 1
+    return incidencia
+
+
+class PontuadorBilhetes:
+    def __init__(self, presenca, min_num):
+        # presenca: incidência 0/1 (sorteios × números), como a de AnaliseCombinatoria.
+        self.presenca = np.asarray(presenca, dtype=np.float32)
+        self.min_num = int(min_num)
+        self.max_num = self.min_num + self.presenca.shape[1] - 1
+
+    @classmethod
+    def de_matriz(cls, matriz):
+        return cls(matriz.incidencia > 0, matriz.min_num)
+
+    @classmethod
+    def de_sorteios(cls, sorteios, min_num, max_num):
+        return cls(incidencia_jogos(sorteios, min_num, max_num), min_num)
+
+    @property
+    def n_sorteios(self):
+        return self.presenca.shape[0]
+
+    def _tamanho_bloco(self, bloco):
+        return bloco or max(1, MAX_ELEMENTOS_BLOCO // max(self.n_sorteios, 1))
+
+    def blocos(self, bilhetes, bloco=None):
+        # Gera (início, acertos) com acertos (bloco × D) em uint8.
+        bilhetes = np.atleast_2d(np.asarray(bilhetes))
+        bloco = self._tamanho_bloco(bloco)
+        for inicio in range(0, len(bilhetes), bloco):
+            incidencia = incidencia_jogos(bilhetes[inicio:inicio + bloco], self.min_num, self.max_num)
+            yield inicio, (incidencia @ self.presenca.T).astype(np.uint8)
+
+    def matriz_acertos(self, bilhetes, bloco=None):
+        # acertos[b, d]: números do bilhete b sorteados no concurso d (N × D).
+        bilhetes = np.atleast_2d(np.asarray(bilhetes))
+        acertos = np.empty((len(bilhetes), self.n_sorteios), dtype=np.uint8)
+        for inicio, parcial in self.blocos(bilhetes, bloco):
+            acertos[inicio:inicio + len(parcial)] = parcial
+        return acertos
+
+    def histograma(self, bilhetes, bloco=None):
+        # histograma[b, h]: em quantos concursos o bilhete b teria acertado h
+        # números (N × k+1), sem montar a matriz N × D inteira.
+        bilhetes = np.atleast_2d(np.asarray(bilhetes))
+        largura = bilhetes.shape[1] + 1
+        histograma = np.empty((len(bilhetes), largura), dtype=np.int64)
+        iguais = None
+        for inicio, parcial in self.blocos(bilhetes, bloco):
+            fim = inicio + len(parcial)
+            if iguais is None or iguais.shape != parcial.shape:
+                iguais = np.empty(parcial.shape, dtype=bool)
+            # Uma comparação por nível de acerto (k é pequeno) é mais rápida que
+            # um bincount sobre o bloco inteiro; zero acertos é o que sobra.
+            for h in range(1, largura):
+                np.equal(parcial, h, out=iguais)
+                histograma[inicio:fim, h] = iguais.sum(axis=1, dtype=np.int32)
+            histograma[inicio:fim, 0] = self.n_sorteios - histograma[inicio:fim, 1:].sum(axis=1)
+        return histograma
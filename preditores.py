@@ -0,0 +1,154 @@
+import numpy as np
+
+# Preditores do modelo multilabel. Recebem as entradas defasadas de
+# caracteristicas.py (uma linha por sorteio-alvo: k defasagens one-hot por
+# número, frequência recente e log1p do atraso) e devolvem, para cada número,
+# a probabilidade de sair no sorteio-alvo. Interface comum:
+#   ajustar(X, y) -> self
+#   probabilidades(X) -> (linhas × números)
+# As linhas de base são NumPy puro e ajustam em milissegundos (a regressão
+# logística, em dezenas deles). O MLP continua sendo treinado pelo
+# scikit-learn (utils/neural.py), mas a predição usa os pesos exportados para
+# arrays NumPy (MLPNumpy), sem o objeto do sklearn.
+
+
+def _sigmoide(z):
+    # Forma com tanh: não estoura para |z| grande.
+    return 0.5 * (1.0 + np.tanh(0.5 * z))
+
+
+class FrequenciaBayesiana:
+    # Média a posteriori Beta-Binomial de cada número. A priori fica centrada
+    # na taxa uniforme (bolas por sorteio / números), com peso de `forca`
+    # sorteios. Ignora as entradas: a previsão é a mesma para qualquer alvo.
+    rotulo = "Frequência bayesiana"
+
+    def __init__(self, forca=10.0):
+        self.forca = forca
+
+    def _pesos(self, n):
+        return np.ones(n)
+
+    def ajustar(self, X, y):
+        y = np.asarray(y, dtype=np.float64)
+        pesos = self._pesos(len(y))
+        taxa = y.sum(axis=1).mean() / y.shape[1] if len(y) else 0.0
+        self.p_ = (pesos @ y + self.forca * taxa) / (pesos.sum() + self.forca)
+        return self
+
+    def probabilidades(self, X):
+        return np.tile(self.p_, (len(X), 1))
+
+
+class DecaimentoExponencial(FrequenciaBayesiana):
+    # Como a frequência bayesiana, mas cada sorteio pesa metade a cada
+    # `meia_vida` sorteios para trás: os recentes dominam a contagem.
+    rotulo = "Contagem com decaimento exponencial"
+
+    def __init__(self, meia_vida=50.0, forca=10.0):
+        super().__init__(forca)
+        self.meia_vida = meia_vida
+
+    def _pesos(self, n):
+        return 0.5 ** (np.arange(n - 1, -1, -1) / self.meia_vida)
+
+
+class RegressaoLogistica:
+    # Uma regressão logística compartilhada por todos os números: cada par
+    # (sorteio-alvo, número) é uma amostra com as k defasagens do próprio
+    # número, a frequência recente, o log do atraso e o intercepto. São só
+    # k + 3 coeficientes, ajustados por Newton (IRLS) com penalidade L2. Cada
+    # iteração monta a hessiana sobre sorteios × números linhas; com só k + 3
+    # coeficientes, os `max_sorteios` sorteios-alvo mais recentes bastam e
+    # mantêm o ajuste em dezenas de milissegundos nos históricos longos.
+    rotulo = "Regressão logística sobre as defasagens"
+
+    def __init__(self, l2=1.0, max_iter=25, tolerancia=1e-6, max_sorteios=1000):
+        self.l2 = l2
+        self.max_iter = max_iter
+        self.tolerancia = tolerancia
+        self.max_sorteios = max_sorteios
+
+    def _desenho(self, X):
+        n, k = self.n_numeros_, self.k_
+        linhas = len(X)
+        desenho = np.empty((linhas, n, k + 3))
+        desenho[..., :k] = X[:, :n * k].reshape(linhas, n, k)
+        desenho[..., k] = X[:, n * k:n * (k + 1)]
+        desenho[..., k + 1] = X[:, n * (k + 1):]
+        desenho[..., k + 2] = 1.0
+        return desenho.reshape(linhas * n, k + 3)
+
+    def ajustar(self, X, y):
+        self.n_numeros_ = y.shape[1]
+        self.k_ = X.shape[1] // self.n_numeros_ - 2
+        if self.max_sorteios is not None:
+            X, y = X[-self.max_sorteios:], y[-self.max_sorteios:]
+        desenho = self._desenho(X)
+        alvo = np.asarray(y, dtype=np.float64).reshape(-1)
+        penalidade = np.diag([self.l2] * (self.k_ + 2) + [0.0])
+        coef = np.zeros(self.k_ + 3)
+        for _ in range(self.max_iter):
+            p = _sigmoide(desenho @ coef)
+            gradiente = desenho.T @ (p - alvo) + penalidade @ coef
+            hessiana = (desenho * (p * (1 - p))[:, None]).T @ desenho + penalidade
+            passo = np.linalg.solve(hessiana, gradiente)
+            coef -= passo
+            if np.abs(passo).max() < self.tolerancia:
+                break
+        self.coef_ = coef
+        return self
+
+    def probabilidades(self, X):
+        return _sigmoide(self._desenho(X) @ self.coef_).reshape(len(X), self.n_numeros_)
+
+
+_ATIVACOES = {
+    "identity": lambda z: z,
+    "relu": lambda z: np.maximum(z, 0, out=z),
+    "tanh": np.tanh,
+    "logistic": _sigmoide,
+}
+
+
+class MLPNumpy:
+    # Pesos de um MLPClassifier já treinado em float32; só o forward. Serve a
+    # mesma predição que predict_proba (saída logística, multilabel) sem a
+    # validação de entrada e o despacho do scikit-learn.
+    rotulo = "MLP exportado (NumPy)"
+
+    def __init__(self, coefs, intercepts, ativacao="relu", saida="logistic"):
+        self.coefs = [np.asarray(c, dtype=np.float32) for c in coefs]
+        self.intercepts = [np.asarray(b, dtype=np.float32) for b in intercepts]
+        self.ativacao = ativacao
+        self.saida = saida
+
+    @classmethod
+    def de_sklearn(cls, modelo):
+        return cls(modelo.coefs_, modelo.intercepts_, modelo.activation, modelo.out_activation_)
+
+    def probabilidades(self, X):
+        a = np.asarray(X, dtype=np.float32)
+        ativacao = _ATIVACOES[self.ativacao]
+        for W, b in zip(self.coefs[:-1], self.intercepts[:-1]):
+            a = ativacao(a @ W + b)
+        z = a @ self.coefs[-1] + self.intercepts[-1]
+        if self.saida == "softmax":
+            z = np.exp(z - z.max(axis=1, keepdims=True))
+            return z / z.sum(axis=1, keepdims=True)
+        return _ATIVACOES[self.saida](z)
+
+
+# Linhas de base por nome; o MLP ("mlp") é tratado em utils/neural.py, que
+# guarda o modelo no registro e acompanha as épocas nas tarefas.
+PREDITORES = {
+    "frequencia_bayesiana": FrequenciaBayesiana,
+    "decaimento_exponencial": DecaimentoExponencial,
+    "regressao_logistica": RegressaoLogistica,
+}
+
+
+def criar_preditor(nome, **params):
+    if nome not in PREDITORES:
+        raise ValueError(f"Preditor desconhecido: {nome}. Opções: {', '.join(PREDITORES)}")
+    return PREDITORES[nome](**params)
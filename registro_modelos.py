@@ -0,0 +1,73 @@
+import hashlib
+import json
+import os
+from importlib import metadata
+
+import pandas as pd
+
+from cache_compartilhado import criar_cache
+
+# Registro de modelos já treinados, guardados no cache compartilhado
+# (cache_compartilhado.py) e reaproveitados por todos os processos do host. A
+# chave combina o jogo, a impressão digital dos dados e os hiperparâmetros;
+# requisições idênticas carregam o pickle em vez de treinar de novo. O espaço
+# das entradas é versionado pelo formato e pela versão do scikit-learn, pois
+# pickles não são portáveis entre versões. Por padrão é um diretório com um
+# arquivo por modelo (LRU pelo mtime, limitado em bytes); LOTERICAS_CACHE_MODELOS
+# aceita também "sqlite:<arquivo>". Como a chave inclui os dados, as entradas
+# não dependem da versão da base e saem só por despejo. A linhagem de um modelo
+# que não veio de um treino completo (ex.: continuado na ingestão) fica num
+# espaço à parte, sob a mesma chave.
+VERSAO_FORMATO = 2
+DIRETORIO_MODELOS = os.environ.get("LOTERICAS_CACHE_MODELOS", os.path.join(".cache", "modelos"))
+MAX_BYTES_MODELOS = int(os.environ.get("LOTERICAS_CACHE_MODELOS_MAX_MB", "1024")) * 1024 * 1024
+
+
+def impressao_digital(df):
+    h = hashlib.sha256()
+    h.update(json.dumps(list(map(str, df.columns))).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return h.hexdigest()
+
+
+def _versao_sklearn():
+    # Lida dos metadados do pacote para não importar o scikit-learn só por isso.
+    try:
+        return metadata.version("scikit-learn")
+    except metadata.PackageNotFoundError:
+        return "0"
+
+
+class RegistroModelos:
+    def __init__(self, diretorio=DIRETORIO_MODELOS, max_bytes=MAX_BYTES_MODELOS, backend=None):
+        self.backend = backend or criar_cache(diretorio, max_bytes=max_bytes)
+        self.espaco = f"v{VERSAO_FORMATO}-sklearn{_versao_sklearn()}"
+
+    def chave(self, **partes):
+        texto = json.dumps(partes, sort_keys=True, default=str)
+        return hashlib.sha256(texto.encode()).hexdigest()[:32]
+
+    def obter(self, chave):
+        return self.backend.obter(self.espaco, chave)
+
+    def guardar(self, chave, modelo):
+        self.backend.guardar(self.espaco, chave, modelo)
+
+    def guardar_linhagem(self, chave, **linhagem):
+        self.backend.guardar(f"{self.espaco}-linhagem", chave, linhagem)
+
+    def linhagem(self, chave):
+        return self.backend.obter(f"{self.espaco}-linhagem", chave)
+
+    def obter_ou_treinar(self, treinar, **partes):
+        return self.backend.obter_ou_calcular(self.espaco, self.chave(**partes), treinar)
+
+    def limpar(self):
+        self.backend.limpar(self.espaco)
+        self.backend.limpar(f"{self.espaco}-linhagem")
+
+    def estatisticas(self):
+        return self.backend.estatisticas()
+
+
+registro_padrao = RegistroModelos()
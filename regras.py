@@ -0,0 +1,139 @@
+import json
+import random
+
+import numpy as np
+
+from matriz_sorteios import VALOR_AUSENTE
+
+# Regras de cada jogo, compiladas a partir de `configs_jogos` (jogos.py), que
+# continua sendo a descrição declarativa. A forma compilada guarda os
+# conjuntos do jogo como arrays (números, trevos, meses, times) e concentra o
+# que antes era decidido pelo nome do jogo em cada tela:
+#   - sortear a aposta e os extras (trevos, time do coração, mês da sorte);
+#   - codificar sorteios e apostas na incidência usada pelas matrizes, pelos
+#     modelos e pela pontuação em lote. Nos jogos de conjunto o código é o
+#     próprio número; nos posicionais (SuperSete) cada (coluna, dígito) tem o
+#     seu código, então os acertos contam por posição e os modelos preveem um
+#     dígito por coluna;
+#   - decodificar as probabilidades por código em uma aposta.
+ROTULOS_EXTRAS = {
+    "trevos": "Trevos sugeridos",
+    "time": "Time do Coração sugerido",
+    "mes": "Mês da Sorte sugerido",
+}
+
+
+class Regras:
+    def __init__(self, config):
+        self.posicional = "quantidade_colunas" in config
+        if self.posicional:
+            self.min_num, self.max_num = config["faixa_numeros_por_coluna"]
+            self.num_bolas = self.n_colunas = config["quantidade_colunas"]
+        else:
+            self.min_num = config.get("min_num", 1)
+            self.max_num = config.get("max_num", 60)
+            self.num_bolas = config.get("num_bolas", 6)
+            self.n_colunas = None
+        self.numeros = np.arange(self.min_num, self.max_num + 1)
+        self.base = len(self.numeros)
+
+        self.trevos = self.quantidade_trevos = None
+        if "quantidade_trevos_selecionar" in config:
+            faixa = config["faixa_trevos_disponiveis"]
+            self.trevos = np.arange(faixa[0], faixa[1] + 1)
+            self.quantidade_trevos = config["quantidade_trevos_selecionar"]
+        self.meses = np.arange(1, 13) if "quantidade_meses_selecionar" in config else None
+        self.times = None
+        if "quantidade_times_selecionar" in config:
+            self.times = np.asarray(config.get("lista_times_disponiveis") or [f"Time {i+1}" for i in range(80)])
+
+    @property
+    def faixa_codigos(self):
+        if self.posicional:
+            return 0, self.n_colunas * self.base - 1
+        return self.min_num, self.max_num
+
+    def codificar(self, jogos):
+        jogos = np.asarray(jogos, dtype=np.int64)
+        if not self.posicional:
+            return jogos
+        deslocamentos = np.arange(jogos.shape[-1]) * self.base - self.min_num
+        return np.where(jogos == VALOR_AUSENTE, VALOR_AUSENTE, jogos + deslocamentos)
+
+    def rotulos(self, codigos):
+        if not self.posicional:
+            return [int(c) for c in codigos]
+        return [f"Coluna {c // self.base + 1}: {c % self.base + self.min_num}" for c in map(int, codigos)]
+
+    def decodificar(self, probabilidades, codigos):
+        # Aposta mais provável: os num_bolas códigos de maior probabilidade ou,
+        # nos posicionais, o dígito mais provável de cada coluna.
+        codigos = np.asarray(codigos)
+        if not self.posicional:
+            indices = np.argsort(probabilidades)[-self.num_bolas:]
+            return sorted(int(codigos[i]) for i in indices)
+        colunas, digitos = np.divmod(codigos, self.base)
+        aposta = []
+        for coluna in range(self.n_colunas):
+            na_coluna = colunas == coluna
+            aposta.append(int(digitos[na_coluna][np.argmax(probabilidades[na_coluna])]) + self.min_num)
+        return aposta
+
+    def sortear_numeros(self):
+        if self.posicional:
+            return [random.randint(self.min_num, self.max_num) for _ in range(self.n_colunas)]
+        return sorted(random.sample(range(self.min_num, self.max_num + 1), self.num_bolas))
+
+    def sortear_extras(self):
+        extras = {}
+        if self.trevos is not None:
+            extras["trevos"] = sorted(random.sample(self.trevos.tolist(), self.quantidade_trevos))
+        if self.times is not None:
+            extras["time"] = str(random.choice(self.times))
+        if self.meses is not None:
+            extras["mes"] = int(random.choice(self.meses))
+        return extras
+
+    def aposta_com_soma(self, soma):
+        # Aposta cuja soma fica perto da prevista (regressor da aba Tradicional):
+        # números consecutivos em torno da média ou, nos posicionais, a soma
+        # repartida entre as colunas.
+        if self.posicional:
+            total = int(np.clip(round(soma), self.min_num * self.n_colunas, self.max_num * self.n_colunas))
+            base, resto = divmod(total - self.min_num * self.n_colunas, self.n_colunas)
+            return [self.min_num + base + (1 if coluna < resto else 0) for coluna in range(self.n_colunas)]
+        media = soma / self.num_bolas
+        jogo = [int(round(media + i - (self.num_bolas // 2))) for i in range(self.num_bolas)]
+        jogo = sorted(set(int(n) for n in np.clip(jogo, self.min_num, self.max_num)))
+        while len(jogo) < self.num_bolas:
+            jogo.append(random.randint(self.min_num, self.max_num))
+            jogo = sorted(set(jogo))
+        return jogo
+
+    def amostrar_por_coluna(self, frequencia, n, rng):
+        # n apostas posicionais com o dígito de cada coluna sorteado com peso
+        # frequência + 1, a partir da frequência por código (coluna, dígito).
+        pesos = np.asarray(frequencia, dtype=np.float64).reshape(self.n_colunas, self.base) + 1
+        pesos /= pesos.sum(axis=1, keepdims=True)
+        colunas = [rng.choice(self.base, size=n, p=p) + self.min_num for p in pesos]
+        return [list(map(int, aposta)) for aposta in np.column_stack(colunas)]
+
+    def completar(self, numeros):
+        # Completa com números sorteados uma aposta com menos de num_bolas.
+        numeros = list(numeros)
+        while not self.posicional and len(numeros) < self.num_bolas:
+            n = random.randint(self.min_num, self.max_num)
+            if n not in numeros:
+                numeros.append(n)
+        return numeros if self.posicional else sorted(numeros)
+
+
+_compiladas = {}
+
+
+def regras_do_jogo(config):
+    chave = json.dumps(config, sort_keys=True)
+    regras = _compiladas.get(chave)
+    if regras is None:
+        regras = _compiladas[chave] = Regras(config)
+    return regras
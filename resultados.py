@@ -0,0 +1,53 @@
+import json
+import os
+
+# Artefatos gerados pelo batch.py: um JSON por jogo e por versão dos dados, de
+# modo que a interface só usa resultados calculados sobre a base que está vendo.
+DIRETORIO_RESULTADOS = os.environ.get("LOTERICAS_RESULTADOS", os.path.join(".cache", "resultados"))
+VERSOES_MANTIDAS = 5
+
+
+def _caminho(jogo, versao, diretorio):
+    return os.path.join(diretorio, jogo, f"{versao}.json")
+
+
+def _converter(valor):
+    # Tipos NumPy (np.int64, np.float64...) não são serializáveis diretamente.
+    if hasattr(valor, "item"):
+        return valor.item()
+    if hasattr(valor, "tolist"):
+        return valor.tolist()
+    raise TypeError(f"Tipo não serializável: {type(valor).__name__}")
+
+
+def gravar_resultado(jogo, versao, resultado, diretorio=DIRETORIO_RESULTADOS):
+    caminho = _caminho(jogo, versao, diretorio)
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2, default=_converter)
+    os.replace(temporario, caminho)
+    _podar(os.path.dirname(caminho))
+    return caminho
+
+
+def _podar(pasta):
+    arquivos = sorted(
+        (os.path.join(pasta, n) for n in os.listdir(pasta) if n.endswith(".json")),
+        key=os.path.getmtime,
+    )
+    for caminho in arquivos[:-VERSOES_MANTIDAS]:
+        try:
+            os.remove(caminho)
+        except OSError:
+            pass
+
+
+def ler_resultado(jogo, versao, diretorio=DIRETORIO_RESULTADOS):
+    if versao is None:
+        return None
+    try:
+        with open(_caminho(jogo, versao, diretorio), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
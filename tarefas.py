@@ -0,0 +1,156 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Treinos em segundo plano para a interface não travar durante `model.fit`.
+# Cada tarefa é identificada por uma chave (jogo + configuração); pedidos
+# idênticos reaproveitam a tarefa em andamento ou já concluída. Tarefas do mesmo
+# grupo (ex.: validação de um jogo numa sessão) com chave diferente são
+# canceladas quando uma nova é submetida: o MLP treina em blocos de poucas
+# épocas (utils.neural.ajustar_mlp) e o cancelamento é verificado entre eles,
+# então um fit em andamento para em poucas épocas em vez de correr junto com o
+# novo quando o usuário mexe num controle no meio do treino. Uma tarefa
+# reaproveitada por vários grupos (sessões diferentes pedindo a mesma chave) só
+# é cancelada quando nenhum deles a quer mais.
+MAX_WORKERS_TAREFAS = int(os.environ.get("LOTERICAS_MAX_TAREFAS", "2"))
+MAX_TAREFAS_GUARDADAS = 64
+
+PENDENTE = "pendente"
+EXECUTANDO = "executando"
+CONCLUIDA = "concluida"
+FALHOU = "falhou"
+CANCELADA = "cancelada"
+
+
+class TarefaCancelada(Exception):
+    pass
+
+
+class Tarefa:
+    def __init__(self, chave, grupo=None):
+        self.chave = chave
+        self.grupos = {grupo}
+        self.estado = PENDENTE
+        self.resultado = None
+        self.erro = None
+        self.parciais = []
+        self.etapa = 0
+        self.total_etapas = 1
+        self.modelo = None
+        self.max_iter = None
+        self.criada_em = time.time()
+        self.concluida_em = None
+        self._cancelar = threading.Event()
+
+    @property
+    def terminada(self):
+        return self.estado in (CONCLUIDA, FALHOU, CANCELADA)
+
+    # Chamados pela função em execução
+    def acompanhar(self, modelo):
+        # O MLP acrescenta a perda de cada época em `loss_curve_` durante o fit;
+        # guardar a referência basta para a interface ler o progresso. O
+        # max_iter é lido aqui, antes de o fit em blocos trocá-lo pelo do bloco.
+        self.verificar_cancelamento()
+        self.modelo = modelo
+        self.max_iter = getattr(modelo, "max_iter", None)
+
+    def definir_etapas(self, total):
+        self.total_etapas = max(1, total)
+
+    def publicar_parcial(self, item):
+        self.parciais.append(item)
+        self.etapa = len(self.parciais)
+        self.verificar_cancelamento()
+
+    def verificar_cancelamento(self):
+        if self._cancelar.is_set():
+            raise TarefaCancelada(self.chave)
+
+    def cancelar(self):
+        self._cancelar.set()
+
+    # Lidos pela interface
+    def progresso(self):
+        modelo = self.modelo
+        perdas = list(getattr(modelo, "loss_curve_", None) or [])
+        max_iter = self.max_iter or 1
+        fracao_etapa = min(len(perdas) / max_iter, 1.0)
+        if self.estado == CONCLUIDA:
+            fracao = 1.0
+        else:
+            fracao = min((self.etapa + fracao_etapa) / self.total_etapas, 0.99)
+        return {
+            "estado": self.estado,
+            "fracao": fracao,
+            "etapa": self.etapa,
+            "total_etapas": self.total_etapas,
+            "epocas": len(perdas),
+            "max_iter": max_iter,
+            "perda": perdas[-1] if perdas else None,
+        }
+
+
+class Agendador:
+    def __init__(self, max_workers=MAX_WORKERS_TAREFAS, max_guardadas=MAX_TAREFAS_GUARDADAS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="lotericas-treino")
+        self._tarefas = OrderedDict()
+        self._trava = threading.Lock()
+        self.max_guardadas = max_guardadas
+
+    def submeter(self, chave, funcao, *args, grupo=None, **kwargs):
+        with self._trava:
+            tarefa = self._tarefas.get(chave)
+            if grupo is not None:
+                for outra in self._tarefas.values():
+                    if grupo in outra.grupos and outra.chave != chave and not outra.terminada:
+                        outra.grupos.discard(grupo)
+                        if not outra.grupos:
+                            outra.cancelar()
+            if tarefa is not None and tarefa.estado not in (FALHOU, CANCELADA):
+                tarefa.grupos.add(grupo)
+                self._tarefas.move_to_end(chave)
+                return tarefa
+            tarefa = Tarefa(chave, grupo=grupo)
+            self._tarefas[chave] = tarefa
+            self._podar()
+        self._executor.submit(self._executar, tarefa, funcao, args, kwargs)
+        return tarefa
+
+    def _executar(self, tarefa, funcao, args, kwargs):
+        tarefa.estado = EXECUTANDO
+        try:
+            tarefa.verificar_cancelamento()
+            tarefa.resultado = funcao(*args, tarefa=tarefa, **kwargs)
+            tarefa.estado = CONCLUIDA
+        except TarefaCancelada:
+            tarefa.estado = CANCELADA
+        except Exception as e:
+            tarefa.erro = e
+            tarefa.estado = FALHOU
+        finally:
+            if tarefa.estado == CONCLUIDA:
+                tarefa.modelo = None
+            tarefa.concluida_em = time.time()
+
+    def _podar(self):
+        excedente = len(self._tarefas) - self.max_guardadas
+        for chave in list(self._tarefas):
+            if excedente <= 0:
+                break
+            if self._tarefas[chave].terminada:
+                del self._tarefas[chave]
+                excedente -= 1
+
+    def obter(self, chave):
+        with self._trava:
+            return self._tarefas.get(chave)
+
+    def tarefas(self):
+        with self._trava:
+            return list(self._tarefas.values())
+
+
+agendador_padrao = Agendador()
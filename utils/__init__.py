@@ -0,0 +1,71 @@
+import importlib
+
+# As funções ficam em submódulos leves; as dependências pesadas só são
+# importadas quando o submódulo é usado:
+#   dados        -> pandas/numpy e o cache colunar
+#   estatisticas -> amostragem e frequências
+#   geracao      -> geradores aleatórios por jogo
+#   neural       -> scikit-learn
+#   graficos     -> matplotlib
+# `from utils import nome` continua funcionando, mas carrega o submódulo de
+# `nome`; o app importa direto do submódulo de cada aba.
+_SUBMODULOS = {
+    # dados
+    "carregar_dados": "dados",
+    "obter_numeros": "dados",
+    "matriz_sorteios": "dados",
+    "frequencia_numeros": "dados",
+    "indice_combinacoes": "dados",
+    "caracteristicas_sorteios": "dados",
+    "analise_combinatoria": "dados",
+    "pontuar_bilhetes": "dados",
+    "verificar_se_jogo_ja_saiu": "dados",
+    "verificar_se_jogos_ja_sairam": "dados",
+    "ingerir_sorteios": "dados",
+    # estatisticas
+    "calcular_acuracia_sugestao": "estatisticas",
+    "cor_fundo_sugestao": "estatisticas",
+    "amostrador_estatistico": "estatisticas",
+    "gerar_multiplas_sugestoes_estatisticas": "estatisticas",
+    "gerar_jogo_estatistico": "estatisticas",
+    "sugestoes_estatisticas": "estatisticas",
+    "frequencia_trevos": "estatisticas",
+    "frequencia_times_timemania": "estatisticas",
+    # geracao
+    "gerar_jogo_completo": "geracao",
+    "gerar_jogo_timemania": "geracao",
+    "gerar_jogo_milionaria": "geracao",
+    "gerar_jogo_supersete": "geracao",
+    # neural
+    "PARAMS_MLP_MULTILABEL": "neural",
+    "PARAMS_MLP_SOMA": "neural",
+    "MODELOS_MULTILABEL": "neural",
+    "gerar_jogo_neural_multilabel": "neural",
+    "validar_modelo_neural_multilabel": "neural",
+    "validar_fold_neural_multilabel": "neural",
+    "validacao_neural": "neural",
+    "comparar_modos_validacao": "neural",
+    "comparar_preditores": "neural",
+    "gerar_jogo_neural": "neural",
+    "sugestao_neural": "neural",
+    "resultado_validacao": "neural",
+    "atualizar_modelos_neurais": "neural",
+    # graficos
+    "exploracao_de_dados": "graficos",
+    "estatisticas_soma": "graficos",
+}
+
+__all__ = sorted(_SUBMODULOS)
+
+
+def __getattr__(nome):
+    submodulo = _SUBMODULOS.get(nome)
+    if submodulo is None:
+        raise AttributeError(f"module 'utils' has no attribute '{nome}'")
+    valor = getattr(importlib.import_module(f"utils.{submodulo}"), nome)
+    globals()[nome] = valor
+    return valor
+
+
+def __dir__():
+    return __all__
@@ -0,0 +1,176 @@
+import threading
+from collections import OrderedDict
+
+from analise_combinatoria import AnaliseCombinatoria
+from armazenamento import anexar_colunar, assinatura_dados, carregar_colunar, versao_dados
+from cache_compartilhado import cache_padrao
+from caracteristicas import JANELA_FREQUENCIA_PADRAO, K_PADRAO, CaracteristicasDefasadas
+from compat_streamlit import st
+from instrumentacao import medir, registrar_cache
+from indice_combinacoes import IndiceCombinacoes
+from matriz_sorteios import MatrizSorteios
+from regras import regras_do_jogo
+from registro_modelos import impressao_digital
+
+@st.cache_data
+def _carregar_dados_versao(jogo, assinatura):
+    registrar_cache(False)
+    return carregar_colunar(jogo)
+
+@medir(cache=True)
+def carregar_dados(jogo):
+    try:
+        # A assinatura do xlsx (e dos sorteios anexados) entra na chave do cache
+        # para que uma base nova invalide a entrada antiga sem reiniciar o servidor.
+        return _carregar_dados_versao(jogo, assinatura_dados(jogo))
+    except Exception as e:
+        st.error(f"Erro ao carregar dados para {jogo}: {e}")
+        return None
+
+@medir
+def obter_numeros(df):
+    return df.filter(regex="(Bola|Coluna)", axis=1)
+
+# Estruturas derivadas do histórico (matriz de sorteios, índice de combinações)
+# indexadas pela impressão digital das bolas. A ingestão incremental grava aqui
+# as versões estendidas, de modo que a próxima leitura já as encontra prontas.
+# Só os tipos de TIPOS_ANEXAVEIS têm `anexar` e são estendidos; os demais
+# (entradas defasadas, análise combinatória) são descartados na ingestão e
+# refeitos sobre a matriz nova na próxima leitura.
+_derivados = OrderedDict()
+_trava_derivados = threading.Lock()
+MAX_DERIVADOS = 32
+TIPOS_ANEXAVEIS = ("matriz", "matriz_faixa", "indice")
+TTL_CARACTERISTICAS_S = 24 * 3600
+
+def _obter_derivado(chave, construir):
+    with _trava_derivados:
+        if chave in _derivados:
+            _derivados.move_to_end(chave)
+            registrar_cache(True)
+            return _derivados[chave]
+    registrar_cache(False)
+    valor = construir()
+    _guardar_derivado(chave, valor)
+    return valor
+
+def _descartar_derivado(chave):
+    with _trava_derivados:
+        _derivados.pop(chave, None)
+
+def _guardar_derivado(chave, valor):
+    with _trava_derivados:
+        _derivados[chave] = valor
+        _derivados.move_to_end(chave)
+        while len(_derivados) > MAX_DERIVADOS:
+            _derivados.popitem(last=False)
+
+def _matriz_de_bolas(bolas_df):
+    return _obter_derivado(("matriz", impressao_digital(bolas_df)), lambda: MatrizSorteios.de_dataframe(bolas_df))
+
+def _matriz_na_faixa(bolas_df, config):
+    # Matriz com as colunas de incidência na faixa completa do jogo, mesmo que
+    # algum número nunca tenha saído. Os sorteios vão codificados pelas regras
+    # do jogo: no SuperSete cada coluna é (coluna, dígito).
+    regras = regras_do_jogo(config)
+    min_num, max_num = regras.faixa_codigos
+    return _obter_derivado(
+        ("matriz_faixa", impressao_digital(bolas_df), min_num, max_num),
+        lambda: MatrizSorteios(regras.codificar(_matriz_de_bolas(bolas_df).bolas), min_num, max_num),
+    )
+
+@medir
+def matriz_sorteios(df):
+    return _matriz_de_bolas(obter_numeros(df))
+
+@medir
+def frequencia_numeros(df):
+    return matriz_sorteios(df).serie_frequencia()
+
+@medir
+def indice_combinacoes(bolas_df, posicional=False):
+    return _obter_derivado(
+        ("indice", impressao_digital(bolas_df), posicional),
+        lambda: IndiceCombinacoes.de_matriz(_matriz_de_bolas(bolas_df), posicional=posicional),
+    )
+
+@medir
+def caracteristicas_sorteios(bolas_df, config, k=K_PADRAO, janela=JANELA_FREQUENCIA_PADRAO, jogo=None, versao=None):
+    # Entradas defasadas do modelo multilabel, compartilhadas entre o treino da
+    # sugestão e todas as janelas da validação da mesma versão dos dados. Vão
+    # também para o cache compartilhado já com X e y calculados, para que outras
+    # réplicas e os workers do backtest não as refaçam; marcadas com o jogo e a
+    # versão da base, saem do cache junto com as validações quando ela muda.
+    min_num, max_num = regras_do_jogo(config).faixa_codigos
+    chave = ("caracteristicas", impressao_digital(bolas_df), min_num, max_num, k, janela)
+
+    def calcular():
+        caracteristicas = CaracteristicasDefasadas(_matriz_na_faixa(bolas_df, config), k=k, janela=janela)
+        caracteristicas.amostras()
+        return caracteristicas
+
+    return _obter_derivado(chave, lambda: cache_padrao.obter_ou_calcular(
+        "caracteristicas", ":".join(map(str, chave[1:])), calcular, ttl=TTL_CARACTERISTICAS_S, jogo=jogo, versao=versao,
+    ))
+
+@medir
+def analise_combinatoria(bolas_df, config):
+    # Coocorrências, atrasos e acertos; as matrizes são calculadas na primeira
+    # consulta e ficam na mesma entrada enquanto a versão dos dados não muda.
+    min_num, max_num = regras_do_jogo(config).faixa_codigos
+    return _obter_derivado(
+        ("analise", impressao_digital(bolas_df), min_num, max_num),
+        lambda: AnaliseCombinatoria(_matriz_na_faixa(bolas_df, config)),
+    )
+
+@medir
+def pontuar_bilhetes(bilhetes, bolas_df, config, histograma=False):
+    # Acertos de cada bilhete (N × k) em todos os concursos: matriz N × D ou,
+    # com histograma=True, contagem de concursos por número de acertos (N × k+1).
+    # No SuperSete os bilhetes são codificados por coluna e os acertos são posicionais.
+    bilhetes = regras_do_jogo(config).codificar(bilhetes)
+    pontuador = analise_combinatoria(bolas_df, config).pontuador
+    return pontuador.histograma(bilhetes) if histograma else pontuador.matriz_acertos(bilhetes)
+
+@medir
+def verificar_se_jogo_ja_saiu(jogo_predito, bolas_df, posicional=False):
+    return indice_combinacoes(bolas_df, posicional).contem(jogo_predito)
+
+@medir
+def verificar_se_jogos_ja_sairam(jogos, bolas_df, posicional=False):
+    return indice_combinacoes(bolas_df, posicional).contem_lote(jogos)
+
+@medir
+def ingerir_sorteios(jogo, novos, config):
+    from utils.neural import atualizar_modelos_neurais
+
+    df, adicionados = anexar_colunar(jogo, novos)
+    resultado = {"df": df, "novos": len(adicionados), "modelos_atualizados": []}
+    if adicionados.empty:
+        return resultado
+
+    bolas_antigo = obter_numeros(df.iloc[:len(df) - len(adicionados)])
+    bolas_novo = obter_numeros(df)
+    bolas_adicionadas = MatrizSorteios.de_dataframe(obter_numeros(adicionados)).bolas
+    # A matriz na faixa do jogo recebe os sorteios codificados pelas regras.
+    novas_por_tipo = {
+        "matriz": bolas_adicionadas,
+        "matriz_faixa": regras_do_jogo(config).codificar(bolas_adicionadas),
+        "indice": bolas_adicionadas,
+    }
+
+    chave_antiga, chave_nova = impressao_digital(bolas_antigo), impressao_digital(bolas_novo)
+    with _trava_derivados:
+        existentes = list(_derivados.items())
+    for (tipo, dados, *resto), valor in existentes:
+        if dados != chave_antiga:
+            continue
+        if tipo in TIPOS_ANEXAVEIS:
+            _guardar_derivado((tipo, chave_nova, *resto), valor.anexar(novas_por_tipo[tipo]))
+        else:
+            _descartar_derivado((tipo, dados, *resto))
+
+    resultado["modelos_atualizados"] = atualizar_modelos_neurais(
+        bolas_antigo, bolas_novo, config, jogo=jogo, versao=versao_dados(jogo),
+    )
+    return resultado
@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+
+from amostrador_estatistico import AmostradorEstatistico, RestricoesImpossiveis
+from compat_streamlit import st
+from instrumentacao import medir, registrar_cache
+from regras import regras_do_jogo
+from utils.dados import analise_combinatoria, matriz_sorteios, obter_numeros
+
+@medir
+def calcular_acuracia_sugestao(sugestao, ultimo_jogo, posicional=False):
+    # Nos jogos posicionais (SuperSete) só conta o dígito certo na coluna certa.
+    if posicional:
+        acertos = sum(bool(a == b) for a, b in zip(sugestao, ultimo_jogo))
+    else:
+        acertos = len(set(sugestao) & set(ultimo_jogo))
+    total = len(ultimo_jogo)
+    return acertos / total if total > 0 else 0
+
+@medir
+def cor_fundo_sugestao(ja_saiu, acuracia_pct):
+    if ja_saiu:
+        return "#00ff3d"  # verde
+    elif acuracia_pct < 50:
+        return "#ff0017"  # vermelho
+    else:
+        return "white"
+
+@medir(cache=True)
+@st.cache_resource(max_entries=32)
+def amostrador_estatistico(freq_series, num_bolas, media_soma, desvio_soma, min_num, max_num):
+    # Tenta primeiro os num_bolas*3 números mais frequentes e, se nenhuma
+    # combinação deles cabe na janela de soma, a faixa inteira do jogo. Se nem
+    # assim houver solução (ex.: soma média calculada sobre mais bolas do que
+    # as do jogo, como na DuplaSena), mantém apenas a restrição de paridade.
+    registrar_cache(False)
+    frequencias = freq_series.reindex(range(min_num, max_num + 1), fill_value=0)
+    topo = frequencias.nlargest(num_bolas * 3).sort_index()
+    for candidatos in (topo, frequencias):
+        try:
+            return AmostradorEstatistico(
+                candidatos.index, candidatos.values + 1, num_bolas,
+                media_soma - desvio_soma, media_soma + desvio_soma,
+            ), False
+        except RestricoesImpossiveis:
+            continue
+    soma_max = sum(range(max_num - num_bolas + 1, max_num + 1))
+    return AmostradorEstatistico(frequencias.index, frequencias.values + 1, num_bolas, 0, soma_max), True
+
+@medir
+def gerar_multiplas_sugestoes_estatisticas(freq_series, num_bolas, media_soma, desvio_soma, min_num, max_num, n_sugestoes=5, seed=0):
+    amostrador, relaxado = amostrador_estatistico(freq_series, num_bolas, media_soma, desvio_soma, min_num, max_num)
+    if relaxado:
+        st.warning("Nenhuma combinação cabe na janela de soma; aplicando apenas a restrição de pares/ímpares.")
+    jogos = amostrador.amostrar(n_sugestoes, np.random.default_rng(seed))
+    return [list(map(int, jogo)) for jogo in jogos]
+
+@medir
+def gerar_jogo_estatistico(freq_series, num_bolas, media_soma, desvio_soma, min_num, max_num, seed=None):
+    return gerar_multiplas_sugestoes_estatisticas(
+        freq_series, num_bolas, media_soma, desvio_soma, min_num, max_num, n_sugestoes=1, seed=seed,
+    )[0]
+
+# Sugestões no formato usado pela interface e pelos artefatos do batch.py
+@medir
+def sugestoes_estatisticas(df, config, n_sugestoes=5, seed=0):
+    matriz = matriz_sorteios(df)
+    ultimo = matriz.ultimo_sorteio()
+    regras = regras_do_jogo(config)
+    if regras.posicional:
+        # Um dígito por coluna, pela frequência de cada dígito naquela coluna.
+        frequencia = analise_combinatoria(obter_numeros(df), config).matriz.frequencia
+        sugestoes = regras.amostrar_por_coluna(frequencia, n_sugestoes, np.random.default_rng(seed))
+    else:
+        media_soma, desvio_soma = matriz.estatisticas_soma()
+        sugestoes = gerar_multiplas_sugestoes_estatisticas(
+            matriz.serie_frequencia(), config["num_bolas"], media_soma, desvio_soma,
+            config["min_num"], config["max_num"], n_sugestoes=n_sugestoes, seed=seed,
+        )
+    return [{"numeros": s, "acuracia": calcular_acuracia_sugestao(s, ultimo, regras.posicional)} for s in sugestoes]
+
+@medir(cache=True)
+@st.cache_data
+def frequencia_trevos(df, config):
+    registrar_cache(False)
+    if "faixa_trevos_disponiveis" not in config:
+        st.warning("Configuração de trevos não encontrada.")
+        return pd.Series(dtype=int)
+
+    faixa = config["faixa_trevos_disponiveis"]
+    colunas_trevos = [col for col in df.columns if "Trevo" in col and df[col].dtype in [int, float, "Int64"]]
+
+    if not colunas_trevos:
+        st.info("Nenhuma coluna de Trevo encontrada.")
+        return pd.Series(dtype=int)
+
+    trevos = df[colunas_trevos].values.flatten()
+    trevos = pd.to_numeric(pd.Series(trevos), errors="coerce").dropna().astype(int)
+
+    trevos = trevos[(trevos >= faixa[0]) & (trevos <= faixa[1])]
+    return trevos.value_counts().sort_index()
+
+@medir(cache=True)
+@st.cache_data
+def frequencia_times_timemania(df):
+    registrar_cache(False)
+    # Supondo que a coluna de time do coração se chama 'Time' ou similar
+    col_time = [col for col in df.columns if "time" in col.lower()]
+    if not col_time:
+        return pd.Series(dtype=int)
+    times = df[col_time[0]].dropna()
+    return times.value_counts()
@@ -0,0 +1,31 @@
+from instrumentacao import medir
+from regras import regras_do_jogo
+from utils.dados import verificar_se_jogo_ja_saiu
+
+@medir
+def gerar_jogo_completo(config, bolas_df=None):
+    regras = regras_do_jogo(config)
+    resultado = {"numeros": regras.sortear_numeros(), **regras.sortear_extras()}
+    if regras.posicional:
+        resultado["colunas"] = resultado["numeros"]
+
+    if bolas_df is not None:
+        resultado["ja_saiu"] = verificar_se_jogo_ja_saiu(resultado["numeros"], bolas_df, regras.posicional)
+    else:
+        resultado["ja_saiu"] = False
+
+    return resultado
+
+@medir
+def gerar_jogo_timemania(config):
+    regras = regras_do_jogo(config)
+    return regras.sortear_numeros(), regras.sortear_extras()["time"]
+
+@medir
+def gerar_jogo_milionaria(config):
+    regras = regras_do_jogo(config)
+    return regras.sortear_numeros(), regras.sortear_extras()["trevos"]
+
+@medir
+def gerar_jogo_supersete(config):
+    return regras_do_jogo(config).sortear_numeros()
@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+
+from cache_graficos import histograma_kde, obter_arrays, obter_imagem
+from compat_streamlit import st
+from instrumentacao import medir
+from regras import regras_do_jogo
+from registro_modelos import impressao_digital
+from utils.dados import analise_combinatoria, matriz_sorteios, obter_numeros
+from utils.estatisticas import frequencia_times_timemania, frequencia_trevos
+
+# Os gráficos saem do cache_graficos, indexados pela versão dos dados
+# (versao_dados do cache colunar, ou a impressão digital do df sem ela).
+def _versao(df, versao):
+    return versao if versao is not None else impressao_digital(df)[:16]
+
+def _serie_em_cache(jogo, versao, tipo, calcular):
+    def arrays():
+        serie = calcular()
+        indice = serie.index.to_numpy()
+        if indice.dtype == object:
+            indice = indice.astype(str)
+        return {"indice": indice, "valores": serie.to_numpy()}
+
+    dados = obter_arrays(jogo, versao, tipo, arrays)
+    return pd.Series(dados["valores"], index=pd.Index(dados["indice"]), name="count")
+
+def _renderizar_histograma(hist):
+    # Figure avulsa (fora do pyplot): não fica registrada no gerenciador de
+    # figuras, então é liberada assim que a imagem é gravada.
+    def renderizar(arquivo, formato):
+        fig = Figure()
+        ax = fig.subplots()
+        bordas = hist["bordas"]
+        ax.bar(bordas[:-1], hist["contagens"], width=np.diff(bordas), align="edge",
+               color="C0", alpha=0.75, edgecolor="white", linewidth=0.5)
+        ax.plot(hist["grade"], hist["kde"], color="C0")
+        ax.set_ylabel("Count")
+        fig.savefig(arquivo, format=formato)
+        fig.clear()
+    return renderizar
+
+# Exploração de dados
+@medir
+def exploracao_de_dados(df, jogo, config, versao=None):
+    matriz = matriz_sorteios(df)
+    versao = _versao(df, versao)
+
+    st.write("### Frequência dos números sorteados")
+    freq_series = _serie_em_cache(jogo, versao, "frequencia_numeros", matriz.serie_frequencia)
+    st.bar_chart(freq_series)
+
+    st.write("### Últimos 5 jogos")
+    bolas = obter_numeros(df)
+    st.dataframe(bolas.tail(5).reset_index(drop=True))
+
+    st.write("### Estatísticas gerais dos números sorteados")
+    st.write(f"- Total de números sorteados: {matriz.total_numeros()}")
+    st.write(f"- Números únicos sorteados: {matriz.numeros_unicos()}")
+    st.write(f"- Número mais frequente: {freq_series.idxmax()} ({freq_series.max()} vezes)")
+    st.write(f"- Número menos frequente: {freq_series.idxmin()} ({freq_series.min()} vezes)")
+
+    regras = regras_do_jogo(config)
+    analise = analise_combinatoria(bolas, config)
+    st.write("### Atrasos")
+    atrasos = pd.DataFrame({
+        "Número": regras.rotulos(analise.numeros),
+        "Atraso atual": analise.atraso_atual,
+        "Atraso máximo": analise.atraso_maximo,
+    })
+    st.dataframe(atrasos.sort_values("Atraso atual", ascending=False, kind="stable").head(10), hide_index=True)
+
+    # Coocorrência e acertos de bilhete não se aplicam a jogos posicionais (SuperSete).
+    if not regras.posicional:
+        _secoes_combinatorias(analise, matriz, jogo, config)
+
+    # Extras do jogo:
+    if regras.trevos is not None:
+        st.write("### Frequência dos Trevos")
+        freq_trevos = _serie_em_cache(jogo, versao, "frequencia_trevos", lambda: frequencia_trevos(df, config))
+        if not freq_trevos.empty:
+            st.bar_chart(freq_trevos)
+        else:
+            st.info("Sem dados válidos de trevos.")
+
+    if regras.times is not None:
+        times_freq = _serie_em_cache(jogo, versao, "frequencia_times", lambda: frequencia_times_timemania(df))
+        if not times_freq.empty:
+            st.write("### Frequência dos Times do Coração")
+            st.bar_chart(times_freq)
+            st.write(f"Time mais sorteado: {times_freq.idxmax()} ({times_freq.max()} vezes)")
+        else:
+            st.write("Nenhuma informação de time disponível.")
+
+def _tabela_combinacoes(combinacoes):
+    return pd.DataFrame(
+        [(" - ".join(map(str, numeros)), vezes) for numeros, vezes in combinacoes],
+        columns=["Números", "Sorteios"],
+    )
+
+def _secoes_combinatorias(analise, matriz, jogo, config):
+    st.write("### Pares mais frequentes")
+    st.dataframe(_tabela_combinacoes(analise.pares_mais_frequentes(10)), hide_index=True)
+
+    st.write("### Trios mais frequentes")
+    st.dataframe(_tabela_combinacoes(analise.trios_mais_frequentes(10)), hide_index=True)
+
+    st.write("### Distribuição de acertos de um bilhete no histórico")
+    num_bolas = config["num_bolas"]
+    opcoes = [int(n) for n in analise.numeros]
+    ultimo = sorted(set(int(n) for n in matriz.ultimo_sorteio()) & set(opcoes))
+    bilhete = st.multiselect(
+        "Números do bilhete", opcoes, default=ultimo[:num_bolas],
+        max_selections=num_bolas, key=f"bilhete_{jogo}",
+    )
+    if bilhete:
+        distribuicao = analise.distribuicao_acertos(bilhete)
+        st.bar_chart(pd.Series(distribuicao, index=pd.Index(range(len(distribuicao)), name="Acertos"), name="Sorteios"))
+
+@medir
+def estatisticas_soma(df, jogo=None, versao=None):
+    matriz = matriz_sorteios(df)
+    soma_jogos = matriz.somas
+    media_soma, desvio_soma = matriz.estatisticas_soma()
+
+    st.markdown("### Estatísticas da Soma dos Jogos")
+    st.write(f"Média da soma: {media_soma:.2f}")
+    st.write(f"Desvio padrão da soma: {desvio_soma:.2f}")
+    versao = _versao(df, versao) if jogo else None
+    hist = obter_arrays(jogo, versao, "histograma_soma", lambda: histograma_kde(soma_jogos, bins=20))
+    st.image(obter_imagem(jogo, versao, "histograma_soma", _renderizar_histograma(hist)))
+
+    # Último sorteio
+    ultimo = matriz.ultimo_sorteio()
+    pares = int(matriz.pares[-1])
+    impares = int(matriz.impares[-1])
+    soma_ultimo = sum(ultimo)
+    st.markdown("### Estatísticas do Último Sorteio")
+    st.write(f"Números sorteados: {', '.join(map(str, ultimo))}")
+    st.write(f"Soma: {soma_ultimo}, Par/Ímpar: {pares} / {impares}")
+
+    return media_soma, desvio_soma
@@ -0,0 +1,379 @@
+import time
+import warnings
+
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.neural_network import MLPClassifier, MLPRegressor
+
+from cache_compartilhado import cache_padrao
+from caracteristicas import JANELA_FREQUENCIA_PADRAO, K_PADRAO
+from compat_streamlit import st
+from instrumentacao import medindo, medir
+from preditores import PREDITORES, MLPNumpy, criar_preditor
+from regras import regras_do_jogo
+from registro_modelos import impressao_digital, registro_padrao
+from utils.dados import caracteristicas_sorteios
+from utils.estatisticas import calcular_acuracia_sugestao
+
+# Com as entradas defasadas (caracteristicas.py) o MLP passa a decorar o
+# histórico se treinar até max_iter; early_stopping separa 10% das amostras e
+# para quando a validação deixa de melhorar.
+PARAMS_MLP_MULTILABEL = {
+    "hidden_layer_sizes": (128, 64), "max_iter": 1000, "random_state": 42, "early_stopping": True,
+}
+PARAMS_MLP_SOMA = {"hidden_layer_sizes": (64, 32), "max_iter": 500, "random_state": 0}
+
+# Os MLPs treinam em blocos de EPOCAS_POR_BLOCO épocas (warm_start): entre um
+# bloco e outro a tarefa verifica o cancelamento, então um treino abandonado
+# para em poucas épocas em vez de ir até max_iter.
+EPOCAS_POR_BLOCO = 10
+
+# Modelos do multilabel: o MLP (guardado no registro, com épocas acompanhadas
+# nas tarefas e predição pelos pesos exportados para NumPy) e as linhas de
+# base de preditores.py, que ajustam em até dezenas de milissegundos e não são
+# guardadas.
+MODELOS_MULTILABEL = ("mlp", *PREDITORES)
+ROTULOS_MODELOS = {"mlp": "MLP (128, 64)", **{nome: classe.rotulo for nome, classe in PREDITORES.items()}}
+
+# Validações prontas ficam no cache compartilhado, marcadas com o jogo e a
+# versão dos dados: réplicas e batch.py reaproveitam o resultado da mesma base.
+TTL_VALIDACAO_S = 7 * 24 * 3600
+
+# Na ingestão (atualizar_modelos_neurais) os modelos não são retreinados: um
+# estimador novo parte dos pesos do modelo da base anterior e ajusta só às
+# amostras novas. partial_fit não aceita early_stopping, então esses modelos
+# têm outros hiperparâmetros e ficam em chaves próprias (origem "incremental"),
+# com a linhagem (modelo de origem, dados da base anterior) no registro.
+PARAMS_MLP_MULTILABEL_INCREMENTAL = {**PARAMS_MLP_MULTILABEL, "early_stopping": False}
+ORIGENS = ("completo", "incremental")
+
+def _chave_multilabel(bolas_df, config, origem="completo"):
+    return {
+        "tipo": "MLPClassifier-multilabel",
+        "dados": impressao_digital(bolas_df),
+        "classes": regras_do_jogo(config).faixa_codigos,
+        "entradas": {"defasagens": K_PADRAO, "janela_frequencia": JANELA_FREQUENCIA_PADRAO},
+        "params": PARAMS_MLP_MULTILABEL if origem == "completo" else PARAMS_MLP_MULTILABEL_INCREMENTAL,
+        "epocas_por_bloco": EPOCAS_POR_BLOCO,
+        "origem": origem,
+    }
+
+def _chave_soma(bolas_df, origem="completo"):
+    return {
+        "tipo": "MLPRegressor-soma", "dados": impressao_digital(bolas_df), "params": PARAMS_MLP_SOMA,
+        "epocas_por_bloco": EPOCAS_POR_BLOCO, "origem": origem,
+    }
+
+def _modelo_registrado(chaves, treinar=None):
+    # Primeiro o treino completo nos dados; sem ele, o modelo continuado na
+    # ingestão; sem nenhum dos dois, treina o completo (se houver `treinar`).
+    for partes in chaves:
+        modelo = registro_padrao.obter(registro_padrao.chave(**partes))
+        if modelo is not None:
+            return modelo
+    if treinar is not None:
+        return registro_padrao.obter_ou_treinar(treinar, **chaves[0])
+    return None
+
+def _continuar_mlp(modelo, classe, params, X, y):
+    # Estimador novo com `params` a partir dos pesos de `modelo`: o primeiro
+    # partial_fit só monta as camadas, as classes e a curva de perda; os pesos
+    # são trocados pelos de `modelo` e uma época com otimizador novo
+    # (warm_start) ajusta às amostras novas.
+    novo = classe(**params)
+    if isinstance(novo, MLPClassifier):
+        novo.partial_fit(X, y, classes=modelo.classes_)
+    else:
+        novo.partial_fit(X, y)
+    novo.coefs_ = [c.copy() for c in modelo.coefs_]
+    novo.intercepts_ = [b.copy() for b in modelo.intercepts_]
+    novo.set_params(warm_start=True, max_iter=1)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", ConvergenceWarning)
+        novo.fit(X, y)
+    novo.set_params(warm_start=False, max_iter=params["max_iter"])
+    return novo
+
+def ajustar_mlp(modelo, X, y, tarefa=None):
+    # fit até max_iter épocas em blocos: o warm_start continua os pesos, a
+    # contagem de épocas sem melhora e os melhores pesos do early_stopping de um
+    # bloco para o seguinte. Um bloco que termina antes do fim convergiu.
+    max_iter, warm_start = modelo.max_iter, modelo.warm_start
+    if tarefa is not None:
+        tarefa.acompanhar(modelo)
+    epocas, convergiu = 0, False
+    try:
+        with medindo(f"{type(modelo).__name__}.fit"), warnings.catch_warnings():
+            warnings.simplefilter("ignore", ConvergenceWarning)
+            while epocas < max_iter:
+                bloco = min(EPOCAS_POR_BLOCO, max_iter - epocas)
+                modelo.set_params(max_iter=bloco, warm_start=warm_start or epocas > 0)
+                modelo.fit(X, y)
+                epocas += modelo.n_iter_
+                if modelo.n_iter_ < bloco:
+                    convergiu = True
+                    break
+                if tarefa is not None:
+                    tarefa.verificar_cancelamento()
+    finally:
+        modelo.set_params(max_iter=max_iter, warm_start=warm_start)
+    if not convergiu:
+        warnings.warn(f"MLP sem convergir em {max_iter} épocas.", ConvergenceWarning)
+    return modelo
+
+@medir
+def gerar_jogo_neural_multilabel(bolas_df, config, tarefa=None, modelo="mlp", jogo=None, versao=None):
+    if len(bolas_df) < 20:
+        st.warning("Dados insuficientes para treino do modelo.")
+        return None
+    caracteristicas = caracteristicas_sorteios(bolas_df, config, jogo=jogo, versao=versao)
+    X, y = caracteristicas.amostras()
+
+    def treinar():
+        return ajustar_mlp(MLPClassifier(**PARAMS_MLP_MULTILABEL), X, y, tarefa)
+
+    if modelo == "mlp":
+        preditor = MLPNumpy.de_sklearn(_modelo_registrado(
+            [_chave_multilabel(bolas_df, config, origem) for origem in ORIGENS], treinar,
+        ))
+    else:
+        preditor = _ajustar_preditor(modelo, X, y)
+    probs = preditor.probabilidades(caracteristicas.entrada(caracteristicas.n_sorteios))[0]
+    regras = regras_do_jogo(config)
+    return regras.completar(regras.decodificar(probs, caracteristicas.numeros))
+
+def _ajustar_preditor(modelo, X, y):
+    with medindo(f"{modelo}.ajustar"):
+        return criar_preditor(modelo).ajustar(X, y)
+
+def _avaliar_fold(preditor, caracteristicas, bolas_df, config, i):
+    regras = regras_do_jogo(config)
+    test_index = -i
+
+    # Entrada do sorteio seguinte ao de índice -i (defasagens até ele).
+    X_test = caracteristicas.entrada(len(bolas_df) + test_index + 1)
+    probs = preditor.probabilidades(X_test)[0]
+
+    numeros_preditos = regras.decodificar(probs, caracteristicas.numeros)
+
+    # Trevos, time e mês não são previstos pelo modelo: saem das regras do jogo.
+    sugestao = {"numeros": numeros_preditos, **regras.sortear_extras()}
+
+    # Avaliação da acurácia
+    jogo_real_idx = test_index + 1
+    if jogo_real_idx >= len(bolas_df):
+        jogo_real_idx = -1
+    jogo_real = bolas_df.iloc[jogo_real_idx].values
+    acuracia = calcular_acuracia_sugestao(numeros_preditos, list(jogo_real), regras.posicional)
+
+    return sugestao, round(acuracia * 100, 2)
+
+@medir
+def validar_modelo_neural_multilabel(bolas_df, config, n_validacoes=10, modo="completo", max_iter_incremental=50,
+                                     tarefa=None, modelo="mlp", jogo=None, versao=None):
+    # modo="completo": um MLP treinado do zero por janela (comportamento original).
+    # modo="incremental": treina uma vez na janela mais antiga e, a cada janela
+    # seguinte, continua o mesmo MLP (warm_start) por poucas épocas a partir dos
+    # pesos já ajustados, já que as janelas diferem por um único sorteio.
+    # Com `tarefa` (ver tarefas.py), cada janela concluída é publicada como
+    # resultado parcial e o cancelamento é verificado entre janelas. Numa tarefa
+    # com mais etapas (ex.: os dois modos da comparação), as janelas continuam
+    # a contagem já publicada.
+    # As janelas treinam com prefixos das mesmas entradas defasadas. Com uma
+    # linha de base (`modelo`), cada janela é reajustada e `modo` não se aplica.
+    caracteristicas = caracteristicas_sorteios(bolas_df, config, jogo=jogo, versao=versao)
+    resultados = []
+
+    model = None
+    if tarefa is not None:
+        tarefa.definir_etapas(max(tarefa.total_etapas, tarefa.etapa + n_validacoes))
+
+    for i in range(n_validacoes, 0, -1):
+        # Treina com os sorteios-alvo anteriores ao de índice -i.
+        X_train, y_train = caracteristicas.amostras(fim=len(bolas_df) - i)
+
+        if modelo != "mlp":
+            preditor = _ajustar_preditor(modelo, X_train, y_train)
+        elif modo == "incremental" and model is not None:
+            model.set_params(warm_start=True, max_iter=max_iter_incremental)
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", ConvergenceWarning)
+                ajustar_mlp(model, X_train, y_train, tarefa)
+        else:
+            model = ajustar_mlp(MLPClassifier(**PARAMS_MLP_MULTILABEL), X_train, y_train, tarefa)
+        if modelo == "mlp":
+            preditor = MLPNumpy.de_sklearn(model)
+
+        resultados.append(_avaliar_fold(preditor, caracteristicas, bolas_df, config, i))
+        if tarefa is not None:
+            sugestao, acuracia = resultados[-1]
+            tarefa.publicar_parcial((i, sugestao, acuracia))
+
+    return resultados
+
+@medir
+def validacao_neural(jogo, versao, bolas_df, config, n_validacoes=10, modo="completo", tarefa=None, modelo="mlp"):
+    chave = registro_padrao.chave(
+        validacao={"modo": modo, "n_validacoes": n_validacoes, "modelo": modelo}, **_chave_multilabel(bolas_df, config)
+    )
+    resultados = cache_padrao.obter("validacao", chave)
+    if resultados is None:
+        resultados = validar_modelo_neural_multilabel(
+            bolas_df, config, n_validacoes=n_validacoes, modo=modo, tarefa=tarefa, modelo=modelo,
+            jogo=jogo, versao=versao,
+        )
+        cache_padrao.guardar("validacao", chave, resultados, ttl=TTL_VALIDACAO_S, jogo=jogo, versao=versao)
+    elif tarefa is not None:
+        for i, (sugestao, acuracia) in zip(range(n_validacoes, 0, -1), resultados):
+            tarefa.publicar_parcial((i, sugestao, acuracia))
+    return resultados
+
+@medir
+def validar_fold_neural_multilabel(bolas_df, config, i, jogo=None, versao=None):
+    # Uma única janela da validação completa (treina até -i-1 e testa em -i);
+    # as janelas são independentes e podem rodar em paralelo (ver backtest.py).
+    caracteristicas = caracteristicas_sorteios(bolas_df, config, jogo=jogo, versao=versao)
+    X_train, y_train = caracteristicas.amostras(fim=len(bolas_df) - i)
+
+    model = ajustar_mlp(MLPClassifier(**PARAMS_MLP_MULTILABEL), X_train, y_train)
+    return _avaliar_fold(MLPNumpy.de_sklearn(model), caracteristicas, bolas_df, config, i)
+
+@medir
+def comparar_modos_validacao(bolas_df, config, n_validacoes=10, max_iter_incremental=50, tarefa=None,
+                             jogo=None, versao=None):
+    comparacao = {}
+    modos = ("completo", "incremental")
+    if tarefa is not None:
+        tarefa.definir_etapas(len(modos) * n_validacoes)
+    for modo in modos:
+        inicio = time.perf_counter()
+        resultados = validar_modelo_neural_multilabel(
+            bolas_df, config, n_validacoes=n_validacoes, modo=modo,
+            max_iter_incremental=max_iter_incremental, tarefa=tarefa, jogo=jogo, versao=versao,
+        )
+        acuracias = [acuracia for _, acuracia in resultados]
+        comparacao[modo] = {
+            "tempo_s": time.perf_counter() - inicio,
+            "acuracia_media": sum(acuracias) / len(acuracias) if acuracias else 0.0,
+            "acuracias": acuracias,
+        }
+    return comparacao
+
+def _latencia_us(prever, entrada, repeticoes):
+    prever(entrada)
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        prever(entrada)
+    return 1e6 * (time.perf_counter() - inicio) / repeticoes
+
+@medir
+def comparar_preditores(bolas_df, config, n_validacoes=10, modelos=MODELOS_MULTILABEL, repeticoes_predicao=200,
+                        tarefa=None, jogo=None, versao=None):
+    # Para cada modelo, nas mesmas janelas walk-forward: tempo médio de ajuste,
+    # latência de uma predição (a entrada do próximo sorteio) e acurácia média.
+    # No MLP, a latência do predict_proba do scikit-learn aparece ao lado da
+    # dos pesos exportados para NumPy. Com `tarefa`, cada janela é publicada
+    # como (modelo, i, acurácia) e o cancelamento é verificado entre janelas.
+    caracteristicas = caracteristicas_sorteios(bolas_df, config, jogo=jogo, versao=versao)
+    entrada = caracteristicas.entrada(caracteristicas.n_sorteios)
+    comparacao = {}
+    if tarefa is not None:
+        tarefa.definir_etapas(len(modelos) * n_validacoes)
+    for modelo in modelos:
+        ajustes, acuracias = [], []
+        for i in range(n_validacoes, 0, -1):
+            X_train, y_train = caracteristicas.amostras(fim=len(bolas_df) - i)
+            inicio = time.perf_counter()
+            if modelo == "mlp":
+                ajustado = ajustar_mlp(MLPClassifier(**PARAMS_MLP_MULTILABEL), X_train, y_train, tarefa)
+                preditor = MLPNumpy.de_sklearn(ajustado)
+            else:
+                preditor = criar_preditor(modelo).ajustar(X_train, y_train)
+            ajustes.append(time.perf_counter() - inicio)
+            acuracias.append(_avaliar_fold(preditor, caracteristicas, bolas_df, config, i)[1])
+            if tarefa is not None:
+                tarefa.publicar_parcial((modelo, i, acuracias[-1]))
+        comparacao[modelo] = {
+            "rotulo": ROTULOS_MODELOS[modelo],
+            "ajuste_ms": 1000 * sum(ajustes) / len(ajustes),
+            "predicao_us": _latencia_us(preditor.probabilidades, entrada, repeticoes_predicao),
+            "predicao_sklearn_us": (
+                _latencia_us(ajustado.predict_proba, entrada, repeticoes_predicao) if modelo == "mlp" else None
+            ),
+            "acuracia_media": sum(acuracias) / len(acuracias),
+            "acuracias": acuracias,
+        }
+    return comparacao
+
+@medir
+def gerar_jogo_neural(bolas_df, config, tarefa=None):
+    if len(bolas_df) < 10:
+        st.warning("Dados insuficientes para treino do modelo neural.")
+        return None
+
+    X = bolas_df.iloc[:-1].values
+    y = bolas_df.sum(axis=1).iloc[1:].values
+
+    def treinar():
+        return ajustar_mlp(MLPRegressor(**PARAMS_MLP_SOMA), X[:-1], y[:-1], tarefa)
+
+    model = _modelo_registrado([_chave_soma(bolas_df, origem) for origem in ORIGENS], treinar)
+
+    soma_prevista = model.predict(X[-1:].reshape(1, -1))[0]
+    return regras_do_jogo(config).aposta_com_soma(soma_prevista)
+
+@medir
+def sugestao_neural(jogo, bolas_df, config, multilabel=False, tarefa=None, modelo="mlp", versao=None):
+    regras = regras_do_jogo(config)
+    if multilabel:
+        numeros = gerar_jogo_neural_multilabel(bolas_df, config, tarefa=tarefa, modelo=modelo, jogo=jogo, versao=versao)
+    else:
+        numeros = gerar_jogo_neural(bolas_df, config, tarefa=tarefa)
+    if not numeros:
+        return None
+    acuracia = calcular_acuracia_sugestao(numeros, list(bolas_df.iloc[-1].values), regras.posicional)
+    return {"numeros": list(map(int, numeros)), "acuracia": acuracia, **regras.sortear_extras()}
+
+@medir
+def resultado_validacao(indice, sugestao, acuracia, historico_combinacoes, posicional=False):
+    jogo_predito_int = tuple(map(int, sugestao["numeros"]))
+    if not posicional:
+        jogo_predito_int = tuple(sorted(jogo_predito_int))
+    return {
+        "indice": indice,
+        "jogo_predito": jogo_predito_int,
+        "acuracia": acuracia,
+        "ja_saiu": jogo_predito_int in historico_combinacoes
+    }
+
+@medir
+def atualizar_modelos_neurais(bolas_antigo, bolas_novo, config, jogo=None, versao=None):
+    # Continua os modelos já treinados no histórico antigo (completos ou já
+    # continuados) apenas com os pares (sorteio anterior -> sorteio novo) e os
+    # registra sob a versão nova dos dados, com origem "incremental".
+    n_antigo, n_novo = len(bolas_antigo), len(bolas_novo)
+    atualizados = []
+
+    modelo = _modelo_registrado([_chave_multilabel(bolas_antigo, config, origem) for origem in ORIGENS])
+    if modelo is not None:
+        X_novos, y_novos = caracteristicas_sorteios(bolas_novo, config, jogo=jogo, versao=versao).amostras(inicio=n_antigo)
+        novo = _continuar_mlp(modelo, MLPClassifier, PARAMS_MLP_MULTILABEL_INCREMENTAL, X_novos, y_novos)
+        _registrar_incremental(_chave_multilabel(bolas_novo, config, "incremental"), novo, bolas_antigo, len(X_novos))
+        atualizados.append("multilabel")
+
+    modelo = _modelo_registrado([_chave_soma(bolas_antigo, origem) for origem in ORIGENS])
+    if modelo is not None:
+        # gerar_jogo_neural treina com os pares (X[:-1], y[:-1]); os pares novos
+        # são os que entram nessa janela com o histórico estendido.
+        X = bolas_novo.iloc[:-1].values[n_antigo - 2:n_novo - 2]
+        y = bolas_novo.sum(axis=1).iloc[1:].values[n_antigo - 2:n_novo - 2]
+        novo = _continuar_mlp(modelo, MLPRegressor, PARAMS_MLP_SOMA, X, y)
+        _registrar_incremental(_chave_soma(bolas_novo, "incremental"), novo, bolas_antigo, len(X))
+        atualizados.append("soma")
+
+    return atualizados
+
+def _registrar_incremental(partes, modelo, bolas_antigo, n_amostras):
+    chave = registro_padrao.chave(**partes)
+    registro_padrao.guardar(chave, modelo)
+    registro_padrao.guardar_linhagem(chave, origem="incremental", dados_base=impressao_digital(bolas_antigo),
+                                     amostras_novas=n_amostras)